@@ -4,6 +4,9 @@ import asyncio
 import json
 from typing import Optional
 from datetime import datetime
+from urllib.parse import quote
+
+import orjson
 
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup, Document
 from telegram.ext import (
@@ -18,17 +21,46 @@ from telegram.ext import (
 import config
 from core.insta_client import InstagramClient
 from core.scheduler import TaskScheduler
-from modules import (
-    FollowFollowersOfFollowers,
-    LikeStoriesOfFollowers,
-    CommentEmoji,
-    UnfollowAfterDelay
-)
-from includes.database import Database
+from includes.database import get_db
 from includes.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# TASK_INTERVALS key for each automation module
+_MODULE_INTERVAL_KEYS = {
+    'follow': 'follow',
+    'stories': 'like_stories',
+    'comment': 'comment',
+    'unfollow': 'unfollow',
+}
+
+# Followers GraphQL query used for manual imports (only variables change per page)
+_FOLLOWERS_QUERY_URL = (
+    "https://www.instagram.com/graphql/query/"
+    "?query_hash=37479f2b8209594dde7facb0d904896a&variables=%s"
+)
+
+
+def _build_followers_url(user_id, after: str = None) -> str:
+    """Build followers GraphQL URL for a user.
+    
+    Args:
+        user_id: Instagram user ID
+        after: Pagination cursor (end_cursor of previous page)
+        
+    Returns:
+        Followers query URL
+    """
+    variables = {
+        'id': str(user_id),
+        'include_reel': True,
+        'fetch_mutual': False,
+        'first': 50,
+    }
+    if after:
+        variables['after'] = after
+    return _FOLLOWERS_QUERY_URL % quote(orjson.dumps(variables).decode(), safe='')
+
 
 class TelegramBot:
     """Telegram bot interface for Instagram automation."""
@@ -36,10 +68,11 @@ class TelegramBot:
     def __init__(self):
         """Initialize Telegram bot."""
         self.app = Application.builder().token(config.TELEGRAM_BOT_TOKEN).build()
-        self.db = Database()
+        self.db = get_db()
         self.insta_client: Optional[InstagramClient] = None
         self.scheduler: Optional[TaskScheduler] = None
         self.modules = {}
+        self.periodic_ids = []  # Scheduler periodic jobs started by "Repeat All"
         self.is_running = False
         self.awaiting_2fa = False
         self.awaiting_json_import = False  # For JSON import
@@ -94,6 +127,59 @@ class TelegramBot:
         """Check if user is admin."""
         return user_id == config.TELEGRAM_ADMIN_ID
 
+    def _build_modules(self) -> dict:
+        """Create the automation modules for the current client and scheduler.
+        
+        The module classes are imported here, on first login, so importing
+        the bot does not pull in every automation module.
+        
+        Returns:
+            Dictionary of module name to module instance
+        """
+        from modules import (
+            FollowFollowersOfFollowers,
+            LikeStoriesOfFollowers,
+            CommentEmoji,
+            UnfollowAfterDelay
+        )
+        
+        return {
+            'follow': FollowFollowersOfFollowers(self.insta_client, self.scheduler),
+            'stories': LikeStoriesOfFollowers(self.insta_client, self.scheduler),
+            'comment': CommentEmoji(self.insta_client, self.scheduler),
+            'unfollow': UnfollowAfterDelay(self.insta_client, self.scheduler)
+        }
+
+    def _start_periodic_modules(self):
+        """Run every module now and then again every TASK_INTERVALS seconds."""
+        if self.periodic_ids:
+            return
+        
+        for name, module in self.modules.items():
+            interval = config.TASK_INTERVALS[_MODULE_INTERVAL_KEYS[name]]
+            self.periodic_ids.append(
+                self.scheduler.add_periodic(module.run, interval, task_type=name)
+            )
+
+    def _cancel_periodic_modules(self):
+        """Stop the periodic module jobs from running again."""
+        if self.scheduler:
+            for periodic_id in self.periodic_ids:
+                self.scheduler.cancel_periodic(periodic_id)
+        self.periodic_ids = []
+
+    def _make_notifier(self):
+        """Build a notifier callable that is safe to use from any thread.
+        
+        Must be called from the event loop; worker threads (scheduler,
+        periodic modules) then hand the message back to that loop.
+        
+        Returns:
+            Function taking a message string
+        """
+        loop = asyncio.get_running_loop()
+        return lambda msg: asyncio.run_coroutine_threadsafe(self.send_notification(msg), loop)
+
     async def send_notification(self, message: str):
         """Send notification to admin."""
         try:
@@ -172,7 +258,7 @@ class TelegramBot:
             
             "<b>⚙️ Automation</b>\n"
             "/start_scheduler - Start tasks\n"
-            "/stop_scheduler - Stop tasks\n"
+            "/stop_scheduler - Stop tasks (and repeating jobs)\n"
             "/pause - Pause tasks\n"
             "/resume - Resume tasks\n\n"
             
@@ -213,25 +299,28 @@ class TelegramBot:
         try:
             await update.message.reply_text("🔑 Logging in to Instagram...")
             
+            # Retire the previous scheduler so its worker and periodic jobs
+            # don't keep running with the old client
+            if self.scheduler:
+                self._cancel_periodic_modules()
+                if self.scheduler.running:
+                    self.scheduler.stop()
+            
+            notifier = self._make_notifier()
             self.insta_client = InstagramClient(
                 username=config.INSTAGRAM_USERNAME,
                 password=config.INSTAGRAM_PASSWORD,
-                telegram_notifier=lambda msg: asyncio.create_task(self.send_notification(msg))
+                telegram_notifier=notifier
             )
             
             self.scheduler = TaskScheduler(
-                telegram_notifier=lambda msg: asyncio.create_task(self.send_notification(msg))
+                telegram_notifier=notifier
             )
             
             success = self.insta_client.login()
             
             if success:
-                self.modules = {
-                    'follow': FollowFollowersOfFollowers(self.insta_client, self.scheduler),
-                    'stories': LikeStoriesOfFollowers(self.insta_client, self.scheduler),
-                    'comment': CommentEmoji(self.insta_client, self.scheduler),
-                    'unfollow': UnfollowAfterDelay(self.insta_client, self.scheduler)
-                }
+                self.modules = self._build_modules()
                 
                 await update.message.reply_text("✅ Login successful!")
             else:
@@ -253,18 +342,13 @@ class TelegramBot:
             await update.message.reply_text("❌ Please /login first")
             return
         
-        user_id = self.insta_client.get_my_user_id()
+        user_id = self.insta_client.my_user_id
         if not user_id:
             await update.message.reply_text("❌ Failed to get user ID")
             return
         
         # Generate GraphQL URL
-        url = (
-            f"https://www.instagram.com/graphql/query/"
-            f"?variables=%7B%22id%22%3A%22{user_id}%22%2C%22include_reel%22%3Atrue%2C"
-            f"%22fetch_mutual%22%3Afalse%2C%22first%22%3A50%7D"
-            f"&query_hash=37479f2b8209594dde7facb0d904896a"
-        )
+        url = _build_followers_url(user_id)
         
         self.awaiting_json_import = True
         self.json_import_state = {
@@ -350,13 +434,7 @@ class TelegramBot:
             
             if has_next and end_cursor:
                 user_id = self.json_import_state.get('user_id')
-                next_url = (
-                    f"https://www.instagram.com/graphql/query/"
-                    f"?variables=%7B%22id%22%3A%22{user_id}%22%2C%22include_reel%22%3Atrue%2C"
-                    f"%22fetch_mutual%22%3Afalse%2C%22first%22%3A50%2C"
-                    f"%22after%22%3A%22{end_cursor}%22%7D"
-                    f"&query_hash=37479f2b8209594dde7facb0d904896a"
-                )
+                next_url = _build_followers_url(user_id, after=end_cursor)
                 
                 response_text += (
                     "🔄 <b>More pages available!</b>\n\n"
@@ -415,8 +493,13 @@ class TelegramBot:
                 parse_mode='HTML'
             )
             
-            user_info = self.insta_client.client.user_info_by_username(username)
-            user_id = user_info.pk
+            user_id = self.insta_client.user_id_from_username(username)
+            if not user_id:
+                await self.update_message(
+                    msg.message_id,
+                    f"❌ <b>User @{username} not found</b>"
+                )
+                return
             
             await self.update_message(
                 msg.message_id,
@@ -472,8 +555,13 @@ class TelegramBot:
                 parse_mode='HTML'
             )
             
-            user_info = self.insta_client.client.user_info_by_username(username)
-            user_id = user_info.pk
+            user_id = self.insta_client.user_id_from_username(username)
+            if not user_id:
+                await self.update_message(
+                    msg.message_id,
+                    f"❌ <b>User @{username} not found</b>"
+                )
+                return
             
             success = self.insta_client.safe_unfollow(user_id)
             
@@ -633,12 +721,7 @@ class TelegramBot:
             self.scheduler.start()
         
         if not self.modules:
-            self.modules = {
-                'follow': FollowFollowersOfFollowers(self.insta_client, self.scheduler),
-                'stories': LikeStoriesOfFollowers(self.insta_client, self.scheduler),
-                'comment': CommentEmoji(self.insta_client, self.scheduler),
-                'unfollow': UnfollowAfterDelay(self.insta_client, self.scheduler)
-            }
+            self.modules = self._build_modules()
         
         keyboard = [
             [InlineKeyboardButton("👥 Follow Followers", callback_data="task_follow")],
@@ -646,6 +729,7 @@ class TelegramBot:
             [InlineKeyboardButton("👍 Like & Comment", callback_data="task_comment")],
             [InlineKeyboardButton("🚫 Unfollow Old", callback_data="task_unfollow")],
             [InlineKeyboardButton("▶️ All Tasks", callback_data="task_all")],
+            [InlineKeyboardButton("🔁 Repeat All", callback_data="task_repeat")],
         ]
         reply_markup = InlineKeyboardMarkup(keyboard)
         
@@ -661,6 +745,7 @@ class TelegramBot:
             return
         
         if self.scheduler:
+            self._cancel_periodic_modules()
             self.scheduler.stop()
             await update.message.reply_text("⏹️ Scheduler stopped")
         else:
@@ -889,6 +974,18 @@ class TelegramBot:
             self.modules['comment'].run()
             self.modules['unfollow'].run()
             await query.message.reply_text("✅ All modules started")
+        
+        elif data == "task_repeat":
+            await query.edit_message_text("🔁 Scheduling all modules...")
+            self._start_periodic_modules()
+            intervals = ", ".join(
+                f"{name} {config.TASK_INTERVALS[key] // 60}m"
+                for name, key in _MODULE_INTERVAL_KEYS.items()
+            )
+            await query.message.reply_text(
+                f"🔁 All modules repeat ({intervals})\n"
+                f"Use /stop_scheduler to stop them"
+            )
 
     async def handle_message(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle text messages."""
@@ -908,12 +1005,7 @@ class TelegramBot:
                     self.awaiting_2fa = False
                     await update.message.reply_text("✅ 2FA successful!")
                     
-                    self.modules = {
-                        'follow': FollowFollowersOfFollowers(self.insta_client, self.scheduler),
-                        'stories': LikeStoriesOfFollowers(self.insta_client, self.scheduler),
-                        'comment': CommentEmoji(self.insta_client, self.scheduler),
-                        'unfollow': UnfollowAfterDelay(self.insta_client, self.scheduler)
-                    }
+                    self.modules = self._build_modules()
                 else:
                     await update.message.reply_text("❌ Invalid code")
         
@@ -48,6 +48,14 @@ RATE_LIMITS = {
     'unfollows_per_day': int(os.getenv('MAX_UNFOLLOWS_PER_DAY', 30)),
 }
 
+# Hard per-minute caps on write actions (token buckets in InstagramClient)
+ACTION_RATES_PER_MINUTE = {
+    'like': int(os.getenv('LIKES_PER_MINUTE', 30)),
+    'comment': int(os.getenv('COMMENTS_PER_MINUTE', 10)),
+    'follow': int(os.getenv('FOLLOWS_PER_MINUTE', 15)),
+    'story_view': int(os.getenv('STORY_VIEWS_PER_MINUTE', 60)),
+}
+
 # Task Intervals (in seconds) - How often each module runs
 TASK_INTERVALS = {
     'follow': int(os.getenv('FOLLOW_INTERVAL', 10800)),        # 3 hours
@@ -74,8 +82,8 @@ LOG_FILE = os.getenv('LOG_FILE', str(LOG_DIR / 'bot.log'))
 
 # Emoji pool for comments (safe, positive emojis)
 EMOJI_COMMENTS = [
-    '❤️', '😍', '🔥', '👏', '✨', '💯', '😊', '🙌',
-    '👍', '💪', '🎉', '⭐', '💖', '🌟', '👌', '😎'
+    '❤️', '🔥', '😍', '👏', '✨', '💯', '👍', '🙌',
+    '❤️🔥', '✨✨', '🔥🔥', '😍😍'
 ]
 
 # Validation
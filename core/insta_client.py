@@ -1,14 +1,17 @@
 """Instagram client wrapper with safe API calls and session management."""
 import time
-import random
 import logging
 import json
+import orjson
 import requests
+from collections import deque
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator, Tuple
 from datetime import datetime, timedelta
+from threading import BoundedSemaphore, Lock
 from urllib.parse import quote
 
+from cachetools import TTLCache
 from instagrapi import Client
 from instagrapi.exceptions import (
     LoginRequired, ChallengeRequired, TwoFactorRequired,
@@ -16,7 +19,9 @@ from instagrapi.exceptions import (
 )
 
 import config
-from includes.database import Database
+from core.jitter import lognormal_delay
+from core.rate_limiter import TokenBucket
+from includes.database import Follower, get_db
 from includes.cache import Cache
 from includes.security import encrypt_data, decrypt_data
 from includes.logger import setup_logger
@@ -46,15 +51,58 @@ class InstagramClient:
         # Set request timeout
         self.client.request_timeout = 10
         
-        self.db = Database()
+        self.db = get_db()
         self.cache = Cache()
+        self.cache.clear_expired()
         self.session_file = config.SESSION_DIR / f"{username}_session.json"
+        self._my_user_id: Optional[int] = None  # Cached by my_user_id once known
         self.is_logged_in = False
         
+        # Retry and delay settings (bound once, used on every call)
+        self._max_retries = config.MAX_RETRIES
+        self._retry_base = config.RETRY_DELAY_BASE
+        self._min_delay = config.MIN_ACTION_DELAY
+        self._max_delay = config.MAX_ACTION_DELAY
+        
         # Rate limiting tracking
         self.last_action_time = None
         self.action_count = {'follow': 0, 'like': 0, 'comment': 0, 'story_view': 0}
-        self.action_timestamps = {'follow': [], 'like': [], 'comment': [], 'story_view': []}
+        self.action_timestamps = {action: deque() for action in self.action_count}
+        self._hourly_limits = {
+            action: config.RATE_LIMITS.get(f"{action}s_per_hour", 999)
+            for action in self.action_count
+        }
+        self._daily_limits = {
+            action: config.RATE_LIMITS.get(f"{action}s_per_day", 9999)
+            for action in self.action_count
+        }
+        
+        # instagrapi's Client keeps the last response on the instance
+        # (last_json), so every call into it is serialized on one lock
+        self._client_lock = Lock()
+        
+        # Per-endpoint pacing: writes to one endpoint (including their human
+        # delay) are serialized, different endpoints may wait in parallel
+        self._endpoint_sem = {
+            'follow': BoundedSemaphore(1),
+            'unfollow': BoundedSemaphore(1),
+            'like': BoundedSemaphore(1),
+            'comment': BoundedSemaphore(1),
+            'story_view': BoundedSemaphore(2),
+        }
+        
+        # Short-lived in-memory cache for media/story reads shared by all
+        # modules; only successful read results are stored
+        self._read_cache = TTLCache(maxsize=1024, ttl=900)
+        self._read_cache_lock = Lock()
+        
+        # Hard per-minute caps, applied right before each write call
+        self._buckets = {
+            action: TokenBucket(rate)
+            for action, rate in config.ACTION_RATES_PER_MINUTE.items()
+        }
+        
+        self._load_rate_state()
 
     def login(self) -> bool:
         """Login to Instagram with session management.
@@ -62,21 +110,27 @@ class InstagramClient:
         Returns:
             bool: True if login successful
         """
+        # Account may change with a new session
+        self._my_user_id = None
+        
         try:
             # Try to load existing session
-            if self._load_session():
-                logger.info(f"✅ Loaded session for {self.username}")
+            with self._client_lock:
+                session_loaded = self._load_session()
+            if session_loaded:
+                logger.info("✅ Loaded session for %s", self.username)
                 self.is_logged_in = True
                 return True
             
             # New login
-            logger.info(f"🔐 Attempting login for {self.username}")
-            self.client.login(self.username, self.password)
+            logger.info("🔐 Attempting login for %s", self.username)
+            with self._client_lock:
+                self.client.login(self.username, self.password)
             self._save_session()
             self.is_logged_in = True
             
             self._notify(f"✅ Successfully logged in to Instagram as {self.username}")
-            logger.info(f"✅ Successfully logged in as {self.username}")
+            logger.info("✅ Successfully logged in as %s", self.username)
             return True
             
         except TwoFactorRequired:
@@ -85,12 +139,12 @@ class InstagramClient:
             return False
             
         except ChallengeRequired as e:
-            logger.warning(f"⚠️ Challenge required: {e}")
+            logger.warning("⚠️ Challenge required: %s", e)
             self._notify(f"⚠️ Instagram challenge required!\n{str(e)}\nPlease verify via Instagram app.")
             return False
             
         except Exception as e:
-            logger.error(f"❌ Login failed: {e}")
+            logger.error("❌ Login failed: %s", e)
             self._notify(f"❌ Login failed: {str(e)}")
             return False
 
@@ -105,14 +159,16 @@ class InstagramClient:
         """
         try:
             # Use the correct method for instagrapi
-            self.client.login(self.username, self.password, verification_code=code)
+            with self._client_lock:
+                self.client.login(self.username, self.password, verification_code=code)
+            self._my_user_id = None
             self._save_session()
             self.is_logged_in = True
             self._notify("✅ 2FA verification successful!")
             logger.info("✅ 2FA verification successful")
             return True
         except Exception as e:
-            logger.error(f"❌ 2FA verification failed: {e}")
+            logger.error("❌ 2FA verification failed: %s", e)
             self._notify(f"❌ 2FA verification failed: {str(e)}")
             return False
 
@@ -128,17 +184,17 @@ class InstagramClient:
                 return False
                 
             logger.debug("📂 Loading session from file...")
-            self.client.load_settings(self.session_file)
+            self.client.set_settings(orjson.loads(self.session_file.read_bytes()))
             self.client.login(self.username, self.password)
             
             # Verify session is valid
             logger.debug("🔍 Verifying session...")
             timeline = self.client.get_timeline_feed()
-            logger.debug(f"✅ Session valid - Timeline has {len(timeline)} items")
+            logger.debug("✅ Session valid - Timeline has %s items", len(timeline))
             return True
             
         except Exception as e:
-            logger.warning(f"⚠️ Failed to load session: {e}")
+            logger.warning("⚠️ Failed to load session: %s", e)
             if self.session_file.exists():
                 logger.debug("🗑️ Deleting invalid session file")
                 self.session_file.unlink()
@@ -147,10 +203,12 @@ class InstagramClient:
     def _save_session(self):
         """Save session to file."""
         try:
-            self.client.dump_settings(self.session_file)
-            logger.info(f"💾 Session saved to {self.session_file}")
+            self.session_file.write_bytes(
+                orjson.dumps(self.client.get_settings(), option=orjson.OPT_NON_STR_KEYS)
+            )
+            logger.info("💾 Session saved to %s", self.session_file)
         except Exception as e:
-            logger.error(f"❌ Failed to save session: {e}")
+            logger.error("❌ Failed to save session: %s", e)
 
     def _notify(self, message: str):
         """Send Telegram notification.
@@ -162,7 +220,7 @@ class InstagramClient:
             try:
                 self.telegram_notifier(message)
             except Exception as e:
-                logger.error(f"Failed to send notification: {e}")
+                logger.error("Failed to send notification: %s", e)
 
     def _wait_random_delay(self, min_delay: int = None, max_delay: int = None):
         """Wait for a random human-like delay.
@@ -171,15 +229,15 @@ class InstagramClient:
             min_delay: Minimum delay in seconds
             max_delay: Maximum delay in seconds
         """
-        min_delay = min_delay or config.MIN_ACTION_DELAY
-        max_delay = max_delay or config.MAX_ACTION_DELAY
+        min_delay = min_delay or self._min_delay
+        max_delay = max_delay or self._max_delay
         
-        # Random delay between min and max
-        delay = random.uniform(min_delay, max_delay)
+        # Log-normal delay within min and max (same policy as the scheduler)
+        delay = lognormal_delay(min_delay, max_delay)
         
-        logger.info(f"⏱️ Waiting {delay:.1f} seconds before action...")
+        logger.info("⏱️ Waiting %.1f seconds before action...", delay)
         time.sleep(delay)
-        logger.info(f"✅ Delay complete, executing action now")
+        logger.info("✅ Delay complete, executing action now")
 
     def _check_rate_limit(self, action_type: str) -> bool:
         """Check if action exceeds rate limits.
@@ -194,31 +252,46 @@ class InstagramClient:
         hour_ago = now - timedelta(hours=1)
         day_ago = now - timedelta(days=1)
         
-        # Clean old timestamps
-        self.action_timestamps[action_type] = [
-            ts for ts in self.action_timestamps[action_type] if ts > day_ago
-        ]
+        # Drop expired timestamps from the front (deque is kept in time order)
+        timestamps = self.action_timestamps[action_type]
+        while timestamps and timestamps[0] <= day_ago:
+            timestamps.popleft()
         
-        # Check hourly limit
-        hourly_count = sum(1 for ts in self.action_timestamps[action_type] if ts > hour_ago)
-        hourly_limit = config.RATE_LIMITS.get(f"{action_type}s_per_hour", 999)
+        # Check hourly limit (scan newest-first, stop at the first older entry)
+        hourly_count = 0
+        for ts in reversed(timestamps):
+            if ts <= hour_ago:
+                break
+            hourly_count += 1
+        hourly_limit = self._hourly_limits[action_type]
         
         if hourly_count >= hourly_limit:
-            logger.warning(f"⚠️ Hourly rate limit reached for {action_type}: {hourly_count}/{hourly_limit}")
+            logger.warning("⚠️ Hourly rate limit reached for %s: %s/%s", action_type, hourly_count, hourly_limit)
             self._notify(f"⚠️ Hourly rate limit reached for {action_type}. Pausing...")
             return False
         
         # Check daily limit
-        daily_count = len(self.action_timestamps[action_type])
-        daily_limit = config.RATE_LIMITS.get(f"{action_type}s_per_day", 9999)
+        daily_count = len(timestamps)
+        daily_limit = self._daily_limits[action_type]
         
         if daily_count >= daily_limit:
-            logger.warning(f"⚠️ Daily rate limit reached for {action_type}: {daily_count}/{daily_limit}")
+            logger.warning("⚠️ Daily rate limit reached for %s: %s/%s", action_type, daily_count, daily_limit)
             self._notify(f"⚠️ Daily rate limit reached for {action_type}. Stopping...")
             return False
         
         return True
 
+    def _load_rate_state(self):
+        """Seed rate limit windows with actions logged in the last day.
+        
+        Keeps limits effective across restarts instead of starting empty.
+        """
+        for action_type, timestamps in self.action_timestamps.items():
+            try:
+                timestamps.extend(self.db.get_action_timestamps(action_type, hours=24))
+            except Exception as e:
+                logger.warning("⚠️ Could not load rate limit state for %s: %s", action_type, e)
+
     def _record_action(self, action_type: str):
         """Record action timestamp for rate limiting.
         
@@ -239,27 +312,31 @@ class InstagramClient:
         Returns:
             Function result or None on failure
         """
-        for attempt in range(config.MAX_RETRIES):
+        max_retries = self._max_retries
+        retry_base = self._retry_base
+        
+        for attempt in range(max_retries):
             try:
-                logger.debug(f"📡 API call: {func.__name__}")
-                result = func(*args, **kwargs)
-                logger.debug(f"✅ API call successful: {func.__name__}")
+                logger.debug("📡 API call: %s", func.__name__)
+                with self._client_lock:
+                    result = func(*args, **kwargs)
+                logger.debug("✅ API call successful: %s", func.__name__)
                 return result
                 
             except RateLimitError as e:
-                wait_time = config.RETRY_DELAY_BASE * (2 ** attempt)
-                logger.warning(f"⚠️ Rate limit hit: {e}. Waiting {wait_time}s...")
+                wait_time = retry_base * (2 ** attempt)
+                logger.warning("⚠️ Rate limit hit: %s. Waiting %ss...", e, wait_time)
                 self._notify(f"⚠️ Instagram rate limit hit. Waiting {wait_time}s...")
                 time.sleep(wait_time)
                 
             except PleaseWaitFewMinutes as e:
                 wait_time = 900  # 15 minutes
-                logger.warning(f"⚠️ Instagram asks to wait: {e}. Waiting {wait_time}s...")
+                logger.warning("⚠️ Instagram asks to wait: %s. Waiting %ss...", e, wait_time)
                 self._notify(f"⚠️ Instagram requests wait. Pausing for 15 minutes...")
                 time.sleep(wait_time)
                 
             except ChallengeRequired as e:
-                logger.error(f"❌ Challenge required: {e}")
+                logger.error("❌ Challenge required: %s", e)
                 challenge_url = "https://www.instagram.com/challenge/"
                 self._notify(
                     f"🚨 <b>Instagram Challenge Required!</b>\n\n"
@@ -270,7 +347,7 @@ class InstagramClient:
                 return None
                 
             except LoginRequired as e:
-                logger.error(f"❌ Login required: {e}")
+                logger.error("❌ Login required: %s", e)
                 self._notify("⚠️ Session expired. Re-logging in...")
                 if self.login():
                     continue
@@ -279,7 +356,7 @@ class InstagramClient:
             except ClientError as e:
                 error_msg = str(e)
                 if 'challenge' in error_msg.lower():
-                    logger.error(f"❌ Challenge detected in error: {error_msg[:100]}")
+                    logger.error("❌ Challenge detected in error: %s", error_msg[:100])
                     self._notify(
                         f"🚨 <b>Instagram Challenge Detected!</b>\n\n"
                         f"Please verify your account at:\n"
@@ -288,17 +365,17 @@ class InstagramClient:
                     )
                     return None
                 
-                logger.error(f"❌ Client error: {error_msg[:100]}")
-                if attempt < config.MAX_RETRIES - 1:
-                    wait_time = config.RETRY_DELAY_BASE * (2 ** attempt)
+                logger.error("❌ Client error: %s", error_msg[:100])
+                if attempt < max_retries - 1:
+                    wait_time = retry_base * (2 ** attempt)
                     time.sleep(wait_time)
                 else:
-                    self._notify(f"❌ API call failed after {config.MAX_RETRIES} attempts")
+                    self._notify(f"❌ API call failed after {max_retries} attempts")
                     return None
                     
             except Exception as e:
                 error_msg = str(e)
-                logger.error(f"❌ Unexpected error: {error_msg[:100]}")
+                logger.error("❌ Unexpected error: %s", error_msg[:100])
                 self._notify(f"❌ Unexpected error: {error_msg[:200]}")
                 return None
         
@@ -315,22 +392,24 @@ class InstagramClient:
         Returns:
             bool: True if successful
         """
-        if not self._check_rate_limit('follow'):
+        with self._endpoint_sem['follow']:
+            if not self._check_rate_limit('follow'):
+                return False
+            
+            logger.info("👤 Preparing to follow user %s...", user_id)
+            self._wait_random_delay()
+            
+            logger.info("📡 Sending follow request for user %s...", user_id)
+            self._buckets['follow'].acquire()
+            result = self._safe_api_call(self.client.user_follow, user_id)
+            
+            if result:
+                self._record_action('follow')
+                logger.info("✅ Successfully followed user %s", user_id)
+                return True
+            
+            logger.error("❌ Failed to follow user %s", user_id)
             return False
-        
-        logger.info(f"👤 Preparing to follow user {user_id}...")
-        self._wait_random_delay()
-        
-        logger.info(f"📡 Sending follow request for user {user_id}...")
-        result = self._safe_api_call(self.client.user_follow, user_id)
-        
-        if result:
-            self._record_action('follow')
-            logger.info(f"✅ Successfully followed user {user_id}")
-            return True
-        
-        logger.error(f"❌ Failed to follow user {user_id}")
-        return False
 
     def safe_unfollow(self, user_id: int) -> bool:
         """Safely unfollow a user.
@@ -341,17 +420,18 @@ class InstagramClient:
         Returns:
             bool: True if successful
         """
-        logger.info(f"👤 Preparing to unfollow user {user_id}...")
-        self._wait_random_delay()
-        
-        result = self._safe_api_call(self.client.user_unfollow, user_id)
-        
-        if result:
-            logger.info(f"✅ Successfully unfollowed user {user_id}")
-            return True
-        
-        logger.error(f"❌ Failed to unfollow user {user_id}")
-        return False
+        with self._endpoint_sem['unfollow']:
+            logger.info("👤 Preparing to unfollow user %s...", user_id)
+            self._wait_random_delay()
+            
+            result = self._safe_api_call(self.client.user_unfollow, user_id)
+            
+            if result:
+                logger.info("✅ Successfully unfollowed user %s", user_id)
+                return True
+            
+            logger.error("❌ Failed to unfollow user %s", user_id)
+            return False
 
     def safe_like(self, media_id: str) -> bool:
         """Safely like a post.
@@ -362,21 +442,23 @@ class InstagramClient:
         Returns:
             bool: True if successful
         """
-        if not self._check_rate_limit('like'):
+        with self._endpoint_sem['like']:
+            if not self._check_rate_limit('like'):
+                return False
+            
+            logger.info("👍 Preparing to like media %s...", media_id)
+            self._wait_random_delay()
+            
+            self._buckets['like'].acquire()
+            result = self._safe_api_call(self.client.media_like, media_id)
+            
+            if result:
+                self._record_action('like')
+                logger.info("✅ Successfully liked media %s", media_id)
+                return True
+            
+            logger.error("❌ Failed to like media %s", media_id)
             return False
-        
-        logger.info(f"👍 Preparing to like media {media_id}...")
-        self._wait_random_delay()
-        
-        result = self._safe_api_call(self.client.media_like, media_id)
-        
-        if result:
-            self._record_action('like')
-            logger.info(f"✅ Successfully liked media {media_id}")
-            return True
-        
-        logger.error(f"❌ Failed to like media {media_id}")
-        return False
 
     def safe_comment(self, media_id: str, text: str) -> bool:
         """Safely comment on a post.
@@ -388,21 +470,23 @@ class InstagramClient:
         Returns:
             bool: True if successful
         """
-        if not self._check_rate_limit('comment'):
+        with self._endpoint_sem['comment']:
+            if not self._check_rate_limit('comment'):
+                return False
+            
+            logger.info("💬 Preparing to comment on media %s...", media_id)
+            self._wait_random_delay(120, 300)  # Longer delay for comments
+            
+            self._buckets['comment'].acquire()
+            result = self._safe_api_call(self.client.media_comment, media_id, text)
+            
+            if result:
+                self._record_action('comment')
+                logger.info("✅ Successfully commented on media %s", media_id)
+                return True
+            
+            logger.error("❌ Failed to comment on media %s", media_id)
             return False
-        
-        logger.info(f"💬 Preparing to comment on media {media_id}...")
-        self._wait_random_delay(120, 300)  # Longer delay for comments
-        
-        result = self._safe_api_call(self.client.media_comment, media_id, text)
-        
-        if result:
-            self._record_action('comment')
-            logger.info(f"✅ Successfully commented on media {media_id}")
-            return True
-        
-        logger.error(f"❌ Failed to comment on media {media_id}")
-        return False
 
     def safe_view_story(self, story_id: str) -> bool:
         """Safely view a story.
@@ -413,58 +497,51 @@ class InstagramClient:
         Returns:
             bool: True if successful
         """
-        if not self._check_rate_limit('story_view'):
+        with self._endpoint_sem['story_view']:
+            if not self._check_rate_limit('story_view'):
+                return False
+            
+            logger.info("👁️ Preparing to view story %s...", story_id)
+            self._wait_random_delay(15, 45)
+            
+            self._buckets['story_view'].acquire()
+            result = self._safe_api_call(self.client.story_seen, [story_id])
+            
+            if result:
+                self._record_action('story_view')
+                logger.info("✅ Viewed story %s", story_id)
+                return True
+            
+            logger.error("❌ Failed to view story %s", story_id)
             return False
-        
-        logger.info(f"👁️ Preparing to view story {story_id}...")
-        self._wait_random_delay(15, 45)
-        
-        result = self._safe_api_call(self.client.story_seen, [story_id])
-        
-        if result:
-            self._record_action('story_view')
-            logger.info(f"✅ Viewed story {story_id}")
-            return True
-        
-        logger.error(f"❌ Failed to view story {story_id}")
-        return False
 
     # Helper methods
     
-    def get_followers_from_db(self, limit: int = 50) -> List[Dict]:
+    def get_followers_from_db(self, limit: int = 50) -> Tuple[Follower, ...]:
         """Get followers from database (no API call).
         
+        Reads are cached in-process for a few minutes and invalidated
+        whenever the follows table is written.
+        
         Args:
             limit: Maximum number of followers to return
             
         Returns:
-            List of follower dictionaries from database
+            Tuple of Follower(pk, username) records from database
         """
-        logger.info(f"💾 Getting {limit} followers from database...")
+        logger.info("💾 Getting %s followers from database...", limit)
         
-        records = self.db.get_active_follows(limit=limit)
+        followers = self.db.get_active_followers(limit=limit)
         
-        if not records:
+        if not followers:
             logger.warning("⚠️ No followers in database! Use /import_followers first")
             self._notify(
                 "⚠️ <b>No followers in database!</b>\n\n"
                 "Please use /import_followers to add followers manually."
             )
-            return []
+            return ()
         
-        # Convert to follower format
-        followers = []
-        for record in records:
-            follower = type('obj', (object,), {
-                'pk': int(record[0]),  # user_id
-                'username': record[1],  # username
-                'full_name': '',
-                'profile_pic_url': '',
-                'is_verified': False
-            })
-            followers.append(follower)
-        
-        logger.info(f"✅ Got {len(followers)} followers from database")
+        logger.info("✅ Got %s followers from database", len(followers))
         return followers
 
     def get_user_followers(self, user_id: int, amount: int = 50) -> List[Dict]:
@@ -486,11 +563,11 @@ class InstagramClient:
         # Try cache first (valid for 1 hour)
         cached = self.cache.get(cache_key, ttl=3600)
         if cached:
-            logger.info(f"💾 Using cached {len(cached)} followers for user {user_id}")
+            logger.info("💾 Using cached %s followers for user %s", len(cached), user_id)
             return cached
         
         # Use instagrapi built-in method (handles pagination)
-        logger.info(f"📡 Fetching up to {amount} followers for user {user_id}...")
+        logger.info("📡 Fetching up to %s followers for user %s...", amount, user_id)
         
         try:
             result = self._safe_api_call(self.client.user_followers, user_id, amount)
@@ -499,31 +576,56 @@ class InstagramClient:
                 logger.warning("⚠️ No followers returned or API error")
                 return []
             
-            # Convert dict to list
-            all_followers = list(result.values())
-            logger.info(f"✅ Successfully fetched {len(all_followers)} followers")
+            # Convert dict to list and build database rows in one pass
+            all_followers = []
+            rows = []
+            for follower in result.values():
+                all_followers.append(follower)
+                rows.append((str(follower.pk), follower.username, "api_fetch"))
+            logger.info("✅ Successfully fetched %s followers", len(all_followers))
             
             # Cache and save to database
             if all_followers:
                 self.cache.set(cache_key, all_followers)
-                logger.info(f"💾 Cached {len(all_followers)} followers")
+                logger.info("💾 Cached %s followers", len(all_followers))
                 
-                # Save to database
-                for follower in all_followers:
-                    self.db.add_follow_record(
-                        str(follower.pk),
-                        follower.username,
-                        "api_fetch"
-                    )
-                logger.info(f"💾 Saved {len(all_followers)} followers to database")
+                self.db.add_follow_records(rows)
+                logger.info("💾 Saved %s followers to database", len(all_followers))
                 
         except Exception as e:
-            logger.error(f"❌ Error fetching followers: {str(e)[:100]}")
+            logger.error("❌ Error fetching followers: %s", str(e)[:100])
             self._notify(f"❌ Error fetching followers: {str(e)[:200]}")
             return []
         
         return all_followers
 
+    def iter_user_followers(self, user_id: int, page_size: int = 50) -> Iterator[Any]:
+        """Yield user followers page by page.
+        
+        Pages are fetched lazily, so a consumer that stops early (e.g. via
+        itertools.islice) never requests the remaining pages. Results are
+        not cached or saved to the database.
+        
+        Args:
+            user_id: Instagram user ID
+            page_size: Number of followers to request per page
+            
+        Yields:
+            Follower objects
+        """
+        max_id = ""
+        while True:
+            page = self._safe_api_call(
+                self.client.user_followers_v1_chunk, user_id, page_size, max_id
+            )
+            if not page:
+                return
+            
+            users, max_id = page
+            yield from users
+            if not max_id:
+                return
+
     def get_user_following(self, user_id: int, amount: int = 50) -> List[Dict]:
         """Get users followed by user with caching.
         
@@ -539,18 +641,18 @@ class InstagramClient:
         # Try cache first
         cached = self.cache.get(cache_key, ttl=3600)
         if cached:
-            logger.info(f"💾 Using cached following for user {user_id}")
+            logger.info("💾 Using cached following for user %s", user_id)
             return cached
         
         # Fetch from API
-        logger.info(f"📡 Fetching {amount} following for user {user_id}...")
+        logger.info("📡 Fetching %s following for user %s...", amount, user_id)
         result = self._safe_api_call(self.client.user_following, user_id, amount)
         following = list(result.values()) if result else []
         
         # Cache result
         if following:
             self.cache.set(cache_key, following)
-            logger.info(f"💾 Cached {len(following)} following")
+            logger.info("💾 Cached %s following", len(following))
         
         return following
 
@@ -564,8 +666,20 @@ class InstagramClient:
         Returns:
             List of media objects
         """
+        key = ('medias', user_id, amount)
+        with self._read_cache_lock:
+            cached = self._read_cache.get(key)
+        if cached is not None:
+            logger.debug("💾 Using cached medias for user %s", user_id)
+            return cached
+        
         result = self._safe_api_call(self.client.user_medias, user_id, amount)
-        return result if result else []
+        
+        if result is None:
+            return []
+        with self._read_cache_lock:
+            self._read_cache[key] = result
+        return result
 
     def get_user_stories(self, user_id: int) -> List[Any]:
         """Get user stories.
@@ -576,28 +690,56 @@ class InstagramClient:
         Returns:
             List of story objects
         """
-        logger.info(f"📖 Fetching stories for user {user_id}...")
-        result = self._safe_api_call(self.client.user_stories, user_id)
+        key = ('stories', user_id)
+        with self._read_cache_lock:
+            cached = self._read_cache.get(key)
+        if cached is not None:
+            logger.debug("💾 Using cached stories for user %s", user_id)
+            return cached
         
+        logger.info("📖 Fetching stories for user %s...", user_id)
+        result = self._safe_api_call(self.client.user_stories, user_id)
+            
         if result:
-            logger.info(f"✅ Found {len(result)} stories")
+            logger.info("✅ Found %s stories", len(result))
         else:
             logger.info("ℹ️ No stories found")
         
-        return result if result else []
+        if result is None:
+            return []
+        with self._read_cache_lock:
+            self._read_cache[key] = result
+        return result
+
+    def user_id_from_username(self, username: str) -> Optional[str]:
+        """Look up a user's ID by username.
+        
+        Args:
+            username: Instagram username
+            
+        Returns:
+            User ID or None if the lookup failed
+        """
+        logger.info("🔍 Looking up user @%s...", username)
+        return self._safe_api_call(self.client.user_id_from_username, username)
 
-    def get_my_user_id(self) -> Optional[int]:
-        """Get authenticated user's ID.
+    @property
+    def my_user_id(self) -> Optional[int]:
+        """Authenticated user's ID, cached for the session.
+        
+        Invalidated on login and 2FA verification. A missing ID is not
+        cached, so it is looked up again on the next access.
         
         Returns:
             User ID or None
         """
-        try:
-            user_id = self.client.user_id
-            logger.debug(f"👤 My user ID: {user_id}")
-            return user_id
-        except:
-            return None
+        if self._my_user_id is None:
+            try:
+                self._my_user_id = self.client.user_id
+                logger.debug("👤 My user ID: %s", self._my_user_id)
+            except:
+                return None
+        return self._my_user_id
 
     def get_stats(self) -> Dict[str, int]:
         """Get current action statistics.
@@ -0,0 +1,35 @@
+"""Shared randomization for action ordering and human-like delays."""
+import math
+import random
+from typing import MutableSequence
+
+# Spread of the log-normal delay (sigma of the underlying normal)
+DELAY_SIGMA = 0.3
+
+_system_random = random.SystemRandom()
+
+
+def shuffle_sec(seq: MutableSequence):
+    """Shuffle a sequence in place using the OS entropy source.
+    
+    Args:
+        seq: Sequence to shuffle
+    """
+    _system_random.shuffle(seq)
+
+
+def lognormal_delay(min_delay: float, max_delay: float, sigma: float = DELAY_SIGMA) -> float:
+    """Draw a log-normal delay centred on the middle of a range.
+    
+    Args:
+        min_delay: Minimum delay in seconds
+        max_delay: Maximum delay in seconds
+        sigma: Spread of the underlying normal
+    
+    Returns:
+        float: Delay in seconds, clamped to [min_delay, max_delay]
+    """
+    # lognormvariate takes the mean/sigma of the underlying normal,
+    # so mu is the log of the target median
+    mu = math.log(max(1, (min_delay + max_delay) / 2))
+    return max(min_delay, min(max_delay, random.lognormvariate(mu, sigma)))
@@ -0,0 +1,68 @@
+"""Token bucket rate limiter for Instagram write actions."""
+import time
+from threading import Lock
+from typing import Optional
+
+
+class TokenBucket:
+    """Thread-safe token bucket enforcing a hard per-minute action rate."""
+
+    def __init__(self, rate_per_minute: float, burst: int = 1):
+        """Initialize token bucket.
+        
+        Args:
+            rate_per_minute: Tokens added per minute
+            burst: Maximum number of tokens that can accumulate
+        """
+        self.rate = rate_per_minute / 60.0
+        self.capacity = float(max(1, burst))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = Lock()
+
+    def _refill(self, now: float):
+        """Add tokens for the time elapsed since the last update.
+        
+        Must be called with _lock held.
+        """
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self) -> bool:
+        """Take a token if one is available without waiting.
+        
+        Returns:
+            bool: True if a token was taken
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """Take a token, blocking until one is available.
+        
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely)
+        
+        Returns:
+            bool: True if a token was taken, False on timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+            
+            if deadline is not None:
+                remaining = deadline - now
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
@@ -1,15 +1,17 @@
 """Task scheduler with randomization and human-like behavior."""
-import time
+import heapq
 import random
 import logging
+import itertools
+from collections import deque
 from datetime import datetime, timedelta
-from typing import Callable, Dict, List, Optional
-from queue import PriorityQueue
-from threading import Thread, Event, Lock
+from typing import Callable, Dict, List, Optional, Set
+from threading import Thread, Event, Condition
 from dataclasses import dataclass, field
 from enum import Enum
 
 import config
+from core.jitter import shuffle_sec, lognormal_delay
 from includes.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -43,15 +45,29 @@ class TaskScheduler:
         Args:
             telegram_notifier: Function to send Telegram notifications
         """
-        self.task_queue = PriorityQueue()
+        # Producers append to a per-priority inbox (deque appends are atomic);
+        # the worker drains inboxes into a timer heap of (scheduled_time, seq, task)
+        # and moves due tasks into a ready heap of (priority, scheduled_time, seq, task),
+        # so priority only orders tasks that are already due
+        self._inbox = {p: deque() for p in sorted(TaskPriority, key=lambda p: p.value)}
+        self._timers: list = []
+        self._ready: list = []
+        self._seq = itertools.count()  # Task sequence number (unique task IDs, FIFO tie-break)
+        self._cond = Condition()
+        self._periodic: Set[str] = set()  # IDs of active periodic tasks
         self.running = False
+        self._stop_event = Event()
         self.paused = Event()
         self.paused.set()  # Start unpaused
         self.worker_thread: Optional[Thread] = None
         self.telegram_notifier = telegram_notifier
-        self.lock = Lock()
         
-        # Statistics
+        # Log-normal delay centred on the middle of the configured range
+        self._min_delay = config.MIN_ACTION_DELAY
+        self._max_delay = config.MAX_ACTION_DELAY
+        
+        # Statistics: completed/failed are written by the worker only and
+        # tasks_scheduled is counted as inboxes are drained under _cond
         self.stats = {
             'tasks_completed': 0,
             'tasks_failed': 0,
@@ -65,6 +81,7 @@ class TaskScheduler:
             return
         
         self.running = True
+        self._stop_event.clear()
         self.worker_thread = Thread(target=self._worker, daemon=True)
         self.worker_thread.start()
         logger.info("Scheduler started")
@@ -77,6 +94,9 @@ class TaskScheduler:
             return
         
         self.running = False
+        self._stop_event.set()
+        with self._cond:
+            self._cond.notify_all()
         if self.worker_thread:
             self.worker_thread.join(timeout=10)
         logger.info("Scheduler stopped")
@@ -91,6 +111,8 @@ class TaskScheduler:
     def resume(self):
         """Resume task execution."""
         self.paused.set()
+        with self._cond:
+            self._cond.notify_all()
         logger.info("Scheduler resumed")
         self._notify("▶️ Tasks resumed")
 
@@ -129,32 +151,19 @@ class TaskScheduler:
         if delay is None:
             delay = self._get_random_delay() if randomize else 0
         
-        scheduled_time = datetime.now() + timedelta(seconds=delay)
-        task_id = f"{task_type}_{int(time.time() * 1000)}"
+        task = self._enqueue(func, task_type, priority, delay, args, kwargs)
+        with self._cond:
+            self._cond.notify()
         
-        task = Task(
-            priority=priority.value,
-            scheduled_time=scheduled_time,
-            task_id=task_id,
-            func=func,
-            args=args,
-            kwargs=kwargs,
-            task_type=task_type
-        )
-        
-        self.task_queue.put(task)
-        
-        with self.lock:
-            self.stats['tasks_scheduled'] += 1
-        
-        logger.debug(f"Scheduled task {task_id} at {scheduled_time} (delay: {delay}s)")
-        return task_id
+        logger.debug(f"Scheduled task {task.task_id} at {task.scheduled_time} (delay: {delay}s)")
+        return task.task_id
 
     def schedule_batch(
         self,
         tasks: List[Dict],
         randomize_order: bool = True,
-        spread_over_minutes: Optional[int] = None
+        spread_over_minutes: Optional[float] = None,
+        start_delay: int = 0
     ):
         """Schedule multiple tasks with randomization.
         
@@ -162,60 +171,161 @@ class TaskScheduler:
             tasks: List of task dictionaries with 'func', 'task_type', etc.
             randomize_order: Randomize task execution order
             spread_over_minutes: Spread tasks over time period
+            start_delay: Seconds added to every task's delay (e.g. to place
+                this batch after earlier batches of the same run)
         """
         task_list = tasks.copy()
+        if not task_list:
+            return
         
         if randomize_order:
-            random.shuffle(task_list)
+            shuffle_sec(task_list)
         
         if spread_over_minutes:
-            # Distribute tasks evenly with randomization
-            total_seconds = spread_over_minutes * 60
-            interval = total_seconds / len(task_list)
-            
-            for i, task_info in enumerate(task_list):
-                # Add jitter to interval
-                delay = int(i * interval + random.uniform(-interval * 0.3, interval * 0.3))
-                delay = max(0, delay)
-                
-                self.schedule_task(
-                    func=task_info['func'],
-                    task_type=task_info.get('task_type', 'generic'),
-                    priority=task_info.get('priority', TaskPriority.NORMAL),
-                    delay=delay,
-                    randomize=False,
-                    *task_info.get('args', ()),
-                    **task_info.get('kwargs', {})
-                )
+            # Distribute tasks evenly with +/-30% jitter on each slot
+            interval = spread_over_minutes * 60 / len(task_list)
+            jitter = interval * 0.3
+            uniform = random.uniform
+            delays = [
+                start_delay + max(0, int(i * interval + uniform(-jitter, jitter)))
+                for i in range(len(task_list))
+            ]
         else:
-            for task_info in task_list:
-                self.schedule_task(
-                    func=task_info['func'],
-                    task_type=task_info.get('task_type', 'generic'),
-                    priority=task_info.get('priority', TaskPriority.NORMAL),
-                    *task_info.get('args', ()),
-                    **task_info.get('kwargs', {})
-                )
+            delays = [start_delay + self._get_random_delay() for _ in task_list]
+        
+        for task_info, delay in zip(task_list, delays):
+            self._enqueue(
+                task_info['func'],
+                task_info.get('task_type', 'generic'),
+                task_info.get('priority', TaskPriority.NORMAL),
+                delay,
+                tuple(task_info.get('args', ())),
+                task_info.get('kwargs', {})
+            )
+        
+        # Wake the worker once for the whole batch
+        with self._cond:
+            self._cond.notify()
         
         logger.info(f"Scheduled {len(task_list)} tasks")
 
+    def add_periodic(
+        self,
+        func: Callable,
+        interval: int,
+        task_type: str = 'generic',
+        priority: TaskPriority = TaskPriority.NORMAL
+    ) -> str:
+        """Run a task now and then again every interval seconds until cancelled.
+        
+        Each run is an ordinary queued task; the next one is scheduled when
+        the previous one finishes, so no thread polls in between.
+        
+        Args:
+            func: Function to execute
+            interval: Seconds between the end of one run and the next
+            task_type: Type of task (for statistics)
+            priority: Task priority
+            
+        Returns:
+            str: Periodic task ID (for cancel_periodic)
+        """
+        periodic_id = f"{task_type}_periodic_{next(self._seq)}"
+        self._periodic.add(periodic_id)
+        
+        def run_and_reschedule():
+            if periodic_id not in self._periodic:
+                return
+            try:
+                func()
+            finally:
+                if periodic_id in self._periodic:
+                    self.schedule_task(run_and_reschedule, task_type, priority, interval, False)
+        
+        self.schedule_task(run_and_reschedule, task_type, priority, 0, False)
+        logger.info(f"Added periodic task {periodic_id} (every {interval}s)")
+        return periodic_id
+
+    def cancel_periodic(self, periodic_id: str):
+        """Stop a periodic task from running again.
+        
+        Args:
+            periodic_id: ID returned by add_periodic
+        """
+        self._periodic.discard(periodic_id)
+
+    def _enqueue(
+        self,
+        func: Callable,
+        task_type: str,
+        priority: TaskPriority,
+        delay: int,
+        args: tuple,
+        kwargs: dict
+    ) -> Task:
+        """Create a task and put it in its priority inbox (worker is not notified).
+        
+        Args:
+            func: Function to execute
+            task_type: Type of task
+            priority: Task priority
+            delay: Delay in seconds
+            args: Function arguments
+            kwargs: Function keyword arguments
+            
+        Returns:
+            Task: Queued task
+        """
+        scheduled_time = datetime.now() + timedelta(seconds=delay)
+        seq = next(self._seq)
+        task_id = f"{task_type}_{seq}"
+        
+        task = Task(
+            priority=priority.value,
+            scheduled_time=scheduled_time,
+            task_id=task_id,
+            func=func,
+            args=args,
+            kwargs=kwargs,
+            task_type=task_type
+        )
+        
+        self._inbox[priority].append((scheduled_time, seq, task))
+        
+        return task
+
     def _get_random_delay(self) -> int:
         """Generate random human-like delay using log-normal distribution.
         
         Returns:
             int: Delay in seconds
         """
-        min_delay = config.MIN_ACTION_DELAY
-        max_delay = config.MAX_ACTION_DELAY
+        return int(lognormal_delay(self._min_delay, self._max_delay))
+
+    def _drain_inboxes(self):
+        """Move newly scheduled tasks from the inboxes into the timer heap.
         
-        # Log-normal distribution for more realistic delays
-        mean = (min_delay + max_delay) / 2
-        sigma = (max_delay - min_delay) / 6
+        Must be called with _cond held.
+        """
+        drained = 0
+        for inbox in self._inbox.values():
+            while inbox:
+                heapq.heappush(self._timers, inbox.popleft())
+                drained += 1
+        self.stats['tasks_scheduled'] += drained
+
+    def _promote_due(self, now: datetime):
+        """Move tasks whose time has come from the timer heap to the ready heap.
         
-        delay = random.lognormvariate(mean, sigma)
-        delay = int(max(min_delay, min(max_delay, delay)))
+        Must be called with _cond held.
         
-        return delay
+        Args:
+            now: Current time
+        """
+        timers, ready = self._timers, self._ready
+        while timers and timers[0][0] <= now:
+            scheduled_time, seq, task = heapq.heappop(timers)
+            heapq.heappush(ready, (task.priority, scheduled_time, seq, task))
 
     def _worker(self):
         """Worker thread to process tasks."""
@@ -223,53 +333,47 @@ class TaskScheduler:
         
         while self.running:
             try:
-                # Wait if paused
-                self.paused.wait()
-                
-                # Get next task (with timeout to check running flag)
-                if self.task_queue.empty():
-                    time.sleep(1)
-                    continue
-                
-                task = self.task_queue.get(timeout=1)
-                
-                # Wait until scheduled time
-                now = datetime.now()
-                if task.scheduled_time > now:
-                    wait_seconds = (task.scheduled_time - now).total_seconds()
-                    if wait_seconds > 0:
-                        logger.debug(f"Waiting {wait_seconds:.1f}s for task {task.task_id}")
-                        time.sleep(wait_seconds)
-                
-                # Check if still running and not paused
-                if not self.running:
-                    break
-                
-                self.paused.wait()
+                # Sleep until the next task is due, a new task arrives or state changes
+                with self._cond:
+                    if not self.running:
+                        break
+                    
+                    self._drain_inboxes()
+                    
+                    if self.is_paused() or not (self._ready or self._timers):
+                        self._cond.wait()
+                        continue
+                    
+                    # Highest priority among due tasks; a future task never
+                    # blocks one that is already due
+                    now = datetime.now()
+                    self._promote_due(now)
+                    if not self._ready:
+                        wait_seconds = (self._timers[0][0] - now).total_seconds()
+                        logger.debug(f"Waiting {wait_seconds:.1f}s for task {self._timers[0][2].task_id}")
+                        self._cond.wait(timeout=wait_seconds)
+                        continue
+                    
+                    task = heapq.heappop(self._ready)[3]
                 
                 # Execute task
                 try:
                     logger.info(f"Executing task {task.task_id} ({task.task_type})")
                     task.func(*task.args, **task.kwargs)
-                    
-                    with self.lock:
-                        self.stats['tasks_completed'] += 1
+                    self.stats['tasks_completed'] += 1
                     
                     logger.debug(f"Task {task.task_id} completed successfully")
                     
                 except Exception as e:
                     logger.error(f"Task {task.task_id} failed: {e}", exc_info=True)
                     self._notify(f"❌ Task failed: {task.task_type}\n{str(e)}")
-                    
-                    with self.lock:
-                        self.stats['tasks_failed'] += 1
-                
-                finally:
-                    self.task_queue.task_done()
+                    self.stats['tasks_failed'] += 1
                 
             except Exception as e:
                 logger.error(f"Worker error: {e}", exc_info=True)
-                time.sleep(1)
+                # Back off briefly, but wake immediately on stop()
+                if self._stop_event.wait(1):
+                    break
         
         logger.info("Scheduler worker stopped")
 
@@ -279,18 +383,27 @@ class TaskScheduler:
         Returns:
             Dictionary with statistics
         """
-        with self.lock:
+        with self._cond:
+            pending = sum(len(q) for q in self._inbox.values())
             return {
                 **self.stats,
-                'queue_size': self.task_queue.qsize(),
+                'tasks_scheduled': self.stats['tasks_scheduled'] + pending,
+                'queue_size': len(self._timers) + len(self._ready) + pending,
                 'is_running': self.running,
                 'is_paused': self.is_paused()
             }
 
     def clear_queue(self):
         """Clear all pending tasks."""
-        with self.task_queue.mutex:
-            self.task_queue.queue.clear()
+        # Swap in empty containers under the lock and let the old tasks be
+        # freed outside it, so producers are not blocked for O(n)
+        with self._cond:
+            old_inbox, self._inbox = self._inbox, {p: deque() for p in self._inbox}
+            old_timers, self._timers = self._timers, []
+            old_ready, self._ready = self._ready, []
+            self.stats['tasks_scheduled'] += sum(len(q) for q in old_inbox.values())
+            self._periodic.clear()
+        del old_inbox, old_timers, old_ready
         logger.info("Task queue cleared")
         self._notify("🗑️ Task queue cleared")
 
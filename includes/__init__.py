@@ -1,7 +1,23 @@
 """Utility modules for the Instagram bot."""
+import importlib
 
-from .database import Database
-from .security import encrypt_data, decrypt_data
-from .logger import setup_logger
+# Resolved on first access (PEP 562) so that importing includes.logger does
+# not also load the MySQL connector and cryptography
+_LAZY_IMPORTS = {
+    'Database': '.database',
+    'get_db': '.database',
+    'encrypt_data': '.security',
+    'decrypt_data': '.security',
+    'setup_logger': '.logger',
+}
 
-__all__ = ['Database', 'encrypt_data', 'decrypt_data', 'setup_logger']
+__all__ = ['Database', 'get_db', 'encrypt_data', 'decrypt_data', 'setup_logger']
+
+
+def __getattr__(name: str):
+    """Import a utility on first access."""
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_IMPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
@@ -1,18 +1,30 @@
 """Simple cache system for Instagram data."""
-import json
+import os
+import orjson
 import time
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from typing import Optional, Any, Dict
-from datetime import datetime, timedelta
 
 import config
 from includes.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Characters that are unsafe in cache file names
+_KEY_TBL = str.maketrans({'/': '_', ':': '_', '\\': '_', '?': '_', '*': '_'})
+
 
 class Cache:
-    """File-based cache with TTL support."""
+    """File-based cache with TTL support.
+    
+    An entry's age is taken from its file modification time, so freshness
+    checks need a single stat() and no parsing. Recently used entries are
+    also kept in a small in-memory LRU so repeated hits skip the disk.
+    """
+    
+    MEM_MAX_ENTRIES = 512
     
     def __init__(self, cache_dir: Path = None):
         """Initialize cache.
@@ -23,6 +35,10 @@ class Cache:
         self.cache_dir = cache_dir or (config.BASE_DIR / 'cache')
         self.cache_dir.mkdir(exist_ok=True)
         
+        # key -> (cached_at, value), most recently used last
+        self._mem: "OrderedDict[str, tuple]" = OrderedDict()
+        self._mem_lock = threading.Lock()
+        
     def _get_cache_file(self, key: str) -> Path:
         """Get cache file path for key.
         
@@ -33,9 +49,23 @@ class Cache:
             Path to cache file
         """
         # Sanitize key for filename
-        safe_key = key.replace('/', '_').replace(':', '_')
+        safe_key = key.translate(_KEY_TBL)
         return self.cache_dir / f"{safe_key}.json"
     
+    def _remember(self, key: str, cached_at: float, value: Any):
+        """Store an entry in the in-memory LRU, evicting the oldest if full.
+        
+        Args:
+            key: Cache key
+            cached_at: Time the value was written
+            value: Cached value
+        """
+        with self._mem_lock:
+            self._mem[key] = (cached_at, value)
+            self._mem.move_to_end(key)
+            if len(self._mem) > self.MEM_MAX_ENTRIES:
+                self._mem.popitem(last=False)
+    
     def get(self, key: str, ttl: int = 3600) -> Optional[Any]:
         """Get value from cache.
         
@@ -46,24 +76,30 @@ class Cache:
         Returns:
             Cached value or None if expired/missing
         """
+        with self._mem_lock:
+            entry = self._mem.get(key)
+            if entry is not None and time.time() - entry[0] <= ttl:
+                self._mem.move_to_end(key)
+                return entry[1]
+        
         cache_file = self._get_cache_file(key)
         
-        if not cache_file.exists():
+        try:
+            cached_at = cache_file.stat().st_mtime
+        except FileNotFoundError:
+            return None
+        
+        # Check if expired (stale files are removed by clear_expired)
+        if time.time() - cached_at > ttl:
+            logger.debug(f"Cache expired for key: {key}")
             return None
         
         try:
-            with open(cache_file, 'r') as f:
-                data = json.load(f)
-            
-            # Check if expired
-            cached_at = datetime.fromisoformat(data['cached_at'])
-            if datetime.now() - cached_at > timedelta(seconds=ttl):
-                logger.debug(f"Cache expired for key: {key}")
-                cache_file.unlink()  # Delete expired cache
-                return None
+            value = orjson.loads(cache_file.read_bytes())['value']
+            self._remember(key, cached_at, value)
             
             logger.debug(f"Cache hit for key: {key}")
-            return data['value']
+            return value
             
         except Exception as e:
             logger.error(f"Error reading cache for {key}: {e}")
@@ -77,20 +113,24 @@ class Cache:
             value: Value to cache (must be JSON serializable)
         """
         cache_file = self._get_cache_file(key)
+        # Write to a per-thread temp file and rename it into place so
+        # readers never see a partially written entry
+        tmp_file = cache_file.with_name(f"{cache_file.name}.{threading.get_ident()}.tmp")
         
         try:
-            data = {
-                'cached_at': datetime.now().isoformat(),
-                'value': value
-            }
-            
-            with open(cache_file, 'w') as f:
-                json.dump(data, f, indent=2)
+            tmp_file.write_bytes(orjson.dumps({'value': value}))
+            os.replace(tmp_file, cache_file)
+            self._remember(key, time.time(), value)
             
             logger.debug(f"Cached value for key: {key}")
             
         except Exception as e:
             logger.error(f"Error writing cache for {key}: {e}")
+            # clear() only matches *.json, so don't leave the temp file behind
+            try:
+                tmp_file.unlink(missing_ok=True)
+            except OSError:
+                pass
     
     def delete(self, key: str):
         """Delete value from cache.
@@ -98,6 +138,9 @@ class Cache:
         Args:
             key: Cache key
         """
+        with self._mem_lock:
+            self._mem.pop(key, None)
+        
         cache_file = self._get_cache_file(key)
         
         if cache_file.exists():
@@ -106,6 +149,8 @@ class Cache:
     
     def clear(self):
         """Clear all cache."""
+        with self._mem_lock:
+            self._mem.clear()
         for cache_file in self.cache_dir.glob('*.json'):
             cache_file.unlink()
         logger.info("Cache cleared")
@@ -117,18 +162,23 @@ class Cache:
             ttl: Time to live in seconds
         """
         count = 0
-        for cache_file in self.cache_dir.glob('*.json'):
-            try:
-                with open(cache_file, 'r') as f:
-                    data = json.load(f)
-                
-                cached_at = datetime.fromisoformat(data['cached_at'])
-                if datetime.now() - cached_at > timedelta(seconds=ttl):
-                    cache_file.unlink()
-                    count += 1
-                    
-            except Exception as e:
-                logger.error(f"Error checking cache file {cache_file}: {e}")
+        cutoff = time.time() - ttl
+        with self._mem_lock:
+            for key in [k for k, (cached_at, _) in self._mem.items() if cached_at < cutoff]:
+                del self._mem[key]
+        with os.scandir(self.cache_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith('.json'):
+                    continue
+                try:
+                    if entry.stat().st_mtime < cutoff:
+                        os.unlink(entry.path)
+                        count += 1
+                        
+                except FileNotFoundError:
+                    continue
+                except Exception as e:
+                    logger.error(f"Error checking cache file {entry.path}: {e}")
         
         if count > 0:
             logger.info(f"Cleared {count} expired cache entries")
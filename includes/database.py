@@ -1,35 +1,132 @@
 """Database connection and operations."""
+import time
+import queue
+import atexit
 import logging
+import threading
+from collections import namedtuple
+from functools import lru_cache
 from typing import Optional, List, Dict, Any, Tuple
-from datetime import datetime
+from datetime import datetime, timedelta
 import mysql.connector
-from mysql.connector import Error
+from mysql.connector import Error, pooling
 from contextlib import contextmanager
 
 import config
+from .id_set import IdSet
 from .logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Compact follower record returned by follower reads
+Follower = namedtuple('Follower', 'pk username')
+
+
+class _FollowerCache:
+    """Process-wide TTL cache of active followers, keyed by limit."""
+
+    def __init__(self):
+        """Initialize an empty cache."""
+        self._entries: Dict[int, Tuple[float, Tuple[Follower, ...]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, limit: int, ttl: int = 300) -> Optional[Tuple[Follower, ...]]:
+        """Get cached followers for a limit if still fresh.
+        
+        Args:
+            limit: Limit the followers were read with
+            ttl: Time to live in seconds
+            
+        Returns:
+            Tuple of followers or None if missing/expired
+        """
+        with self._lock:
+            entry = self._entries.get(limit)
+        if entry is None or time.monotonic() - entry[0] >= ttl:
+            return None
+        return entry[1]
+
+    def put(self, limit: int, followers: Tuple[Follower, ...]):
+        """Store followers read with a limit.
+        
+        Args:
+            limit: Limit the followers were read with
+            followers: Followers to cache
+        """
+        with self._lock:
+            self._entries[limit] = (time.monotonic(), followers)
+
+    def invalidate(self):
+        """Drop all cached entries (called whenever follows change)."""
+        with self._lock:
+            self._entries.clear()
+
+
+_follower_cache = _FollowerCache()
+
 
 class Database:
     """MySQL database handler."""
 
+    # Connection pool shared by all instances (created on first use)
+    POOL_SIZE = 8
+    _pool: Optional[pooling.MySQLConnectionPool] = None
+    _pool_lock = threading.Lock()
+
+    # Active followers are cached in-process for this long
+    FOLLOWER_CACHE_TTL = 300  # seconds
+
+    # Background writer batching
+    WRITE_BATCH_SIZE = 500
+    WRITE_FLUSH_INTERVAL = 0.25  # seconds
+
+    LOG_INSERT_QUERY = """
+        INSERT INTO action_logs (action_type, target_id, success, details, created_at)
+        VALUES (%s, %s, %s, %s, %s)
+    """
+    UNFOLLOW_UPDATE_QUERY = "UPDATE follows SET unfollowed_at = %s WHERE user_id = %s"
+
     def __init__(self):
         """Initialize database connection."""
         self.config = config.DB_CONFIG
         self.connection = None
+        
+        # Fire-and-forget writes (action logs, unfollow marks) are queued as
+        # (query, rows) and written in batches by a background thread
+        self._write_q: queue.Queue = queue.Queue()
+        self._write_thread = threading.Thread(target=self._write_drainer, daemon=True)
+        self._write_thread.start()
+        atexit.register(self.close)
+
+    @classmethod
+    def _get_pool(cls) -> pooling.MySQLConnectionPool:
+        """Get the process-wide connection pool, creating it on first use.
+        
+        Returns:
+            MySQL connection pool
+        """
+        with cls._pool_lock:
+            if cls._pool is None:
+                cls._pool = pooling.MySQLConnectionPool(
+                    pool_name="bot",
+                    pool_size=cls.POOL_SIZE,
+                    pool_reset_session=False,
+                    **config.DB_CONFIG
+                )
+            return cls._pool
 
     @contextmanager
     def get_connection(self):
-        """Get database connection context manager.
+        """Get pooled database connection context manager.
+        
+        Closing the connection returns it to the pool.
         
         Yields:
             MySQL connection
         """
         connection = None
         try:
-            connection = mysql.connector.connect(**self.config)
+            connection = self._get_pool().get_connection()
             yield connection
             connection.commit()
         except Error as e:
@@ -38,7 +135,7 @@ class Database:
                 connection.rollback()
             raise
         finally:
-            if connection and connection.is_connected():
+            if connection:
                 connection.close()
 
     def execute_query(self, query: str, params: tuple = None) -> bool:
@@ -103,22 +200,109 @@ class Database:
             logger.error(f"Fetch all failed: {e}")
             return []
 
+    def close(self):
+        """Flush pending writes and stop the writer thread."""
+        if self._write_thread.is_alive():
+            self._write_q.put(None)
+            self._write_thread.join(timeout=5)
+
     # Logging methods
 
     def log_action(self, action_type: str, target_id: str, success: bool, details: str = None):
         """Log an automation action.
         
+        The row is queued and written by the background writer.
+        
         Args:
             action_type: Type of action (follow, like, comment, etc.)
             target_id: Target user/media ID
             success: Whether action succeeded
             details: Additional details
         """
-        query = """
-            INSERT INTO action_logs (action_type, target_id, success, details, created_at)
-            VALUES (%s, %s, %s, %s, %s)
+        self._write_q.put((self.LOG_INSERT_QUERY, [(action_type, target_id, success, details, datetime.now())]))
+
+    def log_actions_bulk(self, rows: List[tuple]):
+        """Log several automation actions at once.
+        
+        The rows are handed to the background writer as one queue item.
+        
+        Args:
+            rows: List of tuples (action_type, target_id, success, details, created_at)
         """
-        self.execute_query(query, (action_type, target_id, success, details, datetime.now()))
+        if rows:
+            self._write_q.put((self.LOG_INSERT_QUERY, list(rows)))
+
+    def _write_drainer(self):
+        """Background thread writing queued rows in batches."""
+        connection = None
+        running = True
+        
+        while running:
+            item = self._write_q.get()
+            if item is None:
+                break
+            
+            # Collect up to WRITE_BATCH_SIZE rows or until the flush interval
+            # passes, grouped by query (insertion order is kept)
+            batch: Dict[str, List[tuple]] = {}
+            count = 0
+            deadline = time.monotonic() + self.WRITE_FLUSH_INTERVAL
+            while True:
+                query, rows = item
+                batch.setdefault(query, []).extend(rows)
+                count += len(rows)
+                if count >= self.WRITE_BATCH_SIZE:
+                    break
+                
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._write_q.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is None:
+                    running = False
+                    break
+            
+            connection = self._write_batch(connection, batch)
+        
+        if connection and connection.is_connected():
+            connection.close()
+
+    def _write_batch(self, connection, batch: Dict[str, List[tuple]]):
+        """Execute a batch of queued writes in a single transaction.
+        
+        Args:
+            connection: Writer connection (None to open a new one)
+            batch: Mapping of query to its parameter rows
+            
+        Returns:
+            Connection to reuse for the next batch, or None after an error
+        """
+        try:
+            if connection is None or not connection.is_connected():
+                connection = mysql.connector.connect(**self.config)
+            cursor = connection.cursor()
+            for query, rows in batch.items():
+                cursor.executemany(query, rows)
+            cursor.close()
+            connection.commit()
+            
+            # Unfollow marks change the active follows
+            if self.UNFOLLOW_UPDATE_QUERY in batch:
+                _follower_cache.invalidate()
+            return connection
+        except Exception as e:
+            # Any error only drops this batch; the writer thread must keep running
+            count = sum(len(rows) for rows in batch.values())
+            logger.error(f"Background write failed, {count} rows dropped: {e}")
+            if connection:
+                try:
+                    connection.close()
+                except Exception:
+                    pass
+            return None
 
     def get_action_count(self, action_type: str, hours: int = 24) -> int:
         """Get action count for time period.
@@ -132,12 +316,30 @@ class Database:
         """
         query = """
             SELECT COUNT(*) as count FROM action_logs
-            WHERE action_type = %s AND success = TRUE
-            AND created_at >= DATE_SUB(NOW(), INTERVAL %s HOUR)
+            WHERE action_type = %s AND success = TRUE AND created_at >= %s
         """
-        result = self.fetch_one(query, (action_type, hours))
+        cutoff = datetime.now() - timedelta(hours=hours)
+        result = self.fetch_one(query, (action_type, cutoff))
         return result['count'] if result else 0
 
+    def get_action_timestamps(self, action_type: str, hours: int = 24) -> List[datetime]:
+        """Get timestamps of successful actions for time period.
+        
+        Args:
+            action_type: Type of action
+            hours: Time period in hours
+            
+        Returns:
+            List of action timestamps, oldest first
+        """
+        query = """
+            SELECT created_at FROM action_logs
+            WHERE action_type = %s AND success = TRUE AND created_at >= %s
+            ORDER BY created_at ASC
+        """
+        cutoff = datetime.now() - timedelta(hours=hours)
+        return [row['created_at'] for row in self.fetch_all(query, (action_type, cutoff))]
+
     # Follow tracking
 
     def add_follow_record(self, user_id: str, username: str, source: str = None):
@@ -154,6 +356,40 @@ class Database:
             ON DUPLICATE KEY UPDATE followed_at = VALUES(followed_at)
         """
         self.execute_query(query, (user_id, username, datetime.now(), source))
+        _follower_cache.invalidate()
+
+    def add_follow_records(self, records: List[Tuple[str, str, str]]) -> bool:
+        """Add multiple follow records in one batch.
+        
+        Args:
+            records: List of tuples (user_id, username, source)
+            
+        Returns:
+            bool: True if successful
+        """
+        if not records:
+            return True
+        
+        query = """
+            INSERT INTO follows (user_id, username, followed_at, source)
+            VALUES (%s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE followed_at = VALUES(followed_at)
+        """
+        now = datetime.now()
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.executemany(
+                    query,
+                    [(user_id, username, now, source) for user_id, username, source in records]
+                )
+                cursor.close()
+            return True
+        except Error as e:
+            logger.error(f"Add follow records failed: {e}")
+            return False
+        finally:
+            _follower_cache.invalidate()
 
     def get_active_follows(self, limit: int = 50) -> List[Tuple[str, str]]:
         """Get active follows (not unfollowed).
@@ -181,31 +417,73 @@ class Database:
             logger.error(f"Get active follows failed: {e}")
             return []
 
-    def get_users_to_unfollow(self, days: int) -> List[Dict]:
-        """Get users to unfollow after specified days.
+    def get_active_followers(self, limit: int = 50) -> Tuple[Follower, ...]:
+        """Get active follows as Follower records, cached for FOLLOWER_CACHE_TTL.
+        
+        Args:
+            limit: Maximum number of records to return
+            
+        Returns:
+            Tuple of Follower(pk, username)
+        """
+        followers = _follower_cache.get(limit, self.FOLLOWER_CACHE_TTL)
+        if followers is None:
+            followers = tuple(
+                Follower(int(user_id), username)
+                for user_id, username in self.get_active_follows(limit)
+            )
+            if followers:
+                _follower_cache.put(limit, followers)
+        return followers
+
+    def get_followed_user_ids(self) -> IdSet:
+        """Get IDs of every user ever followed, including unfollowed ones.
+        
+        Returns:
+            Compact set of Instagram user IDs
+        """
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT user_id FROM follows")
+                user_ids = IdSet(int(user_id) for (user_id,) in cursor if user_id.isdigit())
+                cursor.close()
+                return user_ids
+        except Error as e:
+            logger.error(f"Get followed user IDs failed: {e}")
+            return IdSet()
+
+    def get_users_to_unfollow(self, days: int, limit: Optional[int] = None) -> List[Dict]:
+        """Get users to unfollow after specified days, oldest follows first.
         
         Args:
             days: Number of days since follow
+            limit: Maximum number of users to return (None for all)
             
         Returns:
             List of user dictionaries
         """
         query = """
             SELECT user_id, username FROM follows
-            WHERE unfollowed_at IS NULL
-            AND followed_at <= DATE_SUB(NOW(), INTERVAL %s DAY)
+            WHERE unfollowed_at IS NULL AND followed_at <= %s
             ORDER BY followed_at ASC
         """
-        return self.fetch_all(query, (days,))
+        params = (datetime.now() - timedelta(days=days),)
+        if limit is not None:
+            query += " LIMIT %s"
+            params += (limit,)
+        return self.fetch_all(query, params)
 
     def mark_unfollowed(self, user_id: str):
         """Mark user as unfollowed.
         
+        The update is queued and written by the background writer, batched
+        with the action logs of the same period.
+        
         Args:
             user_id: Instagram user ID
         """
-        query = "UPDATE follows SET unfollowed_at = %s WHERE user_id = %s"
-        self.execute_query(query, (datetime.now(), user_id))
+        self._write_q.put((self.UNFOLLOW_UPDATE_QUERY, [(datetime.now(), user_id)]))
 
     def add_unfollow_record(self, user_id: str):
         """Mark user as unfollowed (alias for mark_unfollowed).
@@ -256,29 +534,33 @@ class Database:
         Returns:
             Dictionary with statistics
         """
-        stats = {}
+        stats = {'active_follows': 0, 'unfollows': 0}
         
-        # Action counts by type
+        # Action counts by type plus follow/unfollow stats in one round trip
         query = """
-            SELECT action_type, COUNT(*) as count
+            SELECT CONCAT(action_type, '_count') as stat, COUNT(*) as count
             FROM action_logs
-            WHERE success = TRUE AND created_at >= DATE_SUB(NOW(), INTERVAL %s DAY)
+            WHERE success = TRUE AND created_at >= %s
             GROUP BY action_type
+            UNION ALL
+            SELECT 'active_follows', COUNT(*) FROM follows WHERE unfollowed_at IS NULL
+            UNION ALL
+            SELECT 'unfollows', COUNT(*) FROM follows WHERE unfollowed_at >= %s
         """
-        results = self.fetch_all(query, (days,))
-        for row in results:
-            stats[f"{row['action_type']}_count"] = row['count']
-        
-        # Follow/unfollow stats
-        query = "SELECT COUNT(*) as count FROM follows WHERE unfollowed_at IS NULL"
-        result = self.fetch_one(query)
-        stats['active_follows'] = result['count'] if result else 0
-        
-        query = """
-            SELECT COUNT(*) as count FROM follows
-            WHERE unfollowed_at >= DATE_SUB(NOW(), INTERVAL %s DAY)
-        """
-        result = self.fetch_one(query, (days,))
-        stats['unfollows'] = result['count'] if result else 0
+        cutoff = datetime.now() - timedelta(days=days)
+        for row in self.fetch_all(query, (cutoff, cutoff)):
+            stats[row['stat']] = row['count']
         
         return stats
+
+
+@lru_cache(maxsize=1)
+def get_db() -> Database:
+    """Get the process-wide Database instance.
+    
+    Sharing one instance keeps a single action-log writer thread.
+    
+    Returns:
+        Shared Database instance
+    """
+    return Database()
@@ -7,37 +7,32 @@ import coloredlogs
 
 import config
 
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
 # Create logs directory
 log_file = Path(config.LOG_FILE)
 log_file.parent.mkdir(parents=True, exist_ok=True)
 
-# Configure root logger
+# Configure root logger once: plain file output plus colored console output
 logging.basicConfig(
     level=getattr(logging, config.LOG_LEVEL),
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    format=LOG_FORMAT,
     handlers=[
-        logging.FileHandler(config.LOG_FILE),
-        logging.StreamHandler(sys.stdout)
+        logging.FileHandler(config.LOG_FILE)
     ]
 )
+coloredlogs.install(level=config.LOG_LEVEL, fmt=LOG_FORMAT, stream=sys.stdout)
 
 
 def setup_logger(name: str) -> logging.Logger:
     """Setup logger for a module.
     
+    Handlers live on the root logger, so module loggers only propagate.
+    
     Args:
         name: Logger name (usually __name__)
-        
+    
     Returns:
         Configured logger
     """
-    logger = logging.getLogger(name)
-    
-    # Add colored output for console
-    coloredlogs.install(
-        level=config.LOG_LEVEL,
-        logger=logger,
-        fmt='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
-    
-    return logger
+    return logging.getLogger(name)
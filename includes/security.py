@@ -1,5 +1,4 @@
 """Security utilities for encryption and data protection."""
-import base64
 import logging
 from typing import Optional
 
@@ -10,6 +9,13 @@ from .logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Fernet instance built once from the configured key
+try:
+    _FERNET = Fernet(config.ENCRYPTION_KEY) if config.ENCRYPTION_KEY else None
+except ValueError as e:
+    logger.error(f"Invalid encryption key: {e}")
+    _FERNET = None
+
 
 def encrypt_data(data: str) -> Optional[str]:
     """Encrypt sensitive data.
@@ -18,15 +24,17 @@ def encrypt_data(data: str) -> Optional[str]:
         data: Plain text data
         
     Returns:
-        Encrypted data as base64 string or None on error
+        Fernet token (URL-safe base64 string) or None on error
     """
     try:
         if not data:
             return None
         
-        fernet = Fernet(config.ENCRYPTION_KEY)
-        encrypted = fernet.encrypt(data.encode())
-        return base64.b64encode(encrypted).decode()
+        if _FERNET is None:
+            logger.error("Encryption failed: no valid encryption key")
+            return None
+        
+        return _FERNET.encrypt(data.encode()).decode('ascii')
     except Exception as e:
         logger.error(f"Encryption failed: {e}")
         return None
@@ -36,7 +44,7 @@ def decrypt_data(encrypted_data: str) -> Optional[str]:
     """Decrypt sensitive data.
     
     Args:
-        encrypted_data: Encrypted data as base64 string
+        encrypted_data: Fernet token as returned by encrypt_data
         
     Returns:
         Decrypted plain text or None on error
@@ -45,10 +53,11 @@ def decrypt_data(encrypted_data: str) -> Optional[str]:
         if not encrypted_data:
             return None
         
-        fernet = Fernet(config.ENCRYPTION_KEY)
-        encrypted_bytes = base64.b64decode(encrypted_data.encode())
-        decrypted = fernet.decrypt(encrypted_bytes)
-        return decrypted.decode()
+        if _FERNET is None:
+            logger.error("Decryption failed: no valid encryption key")
+            return None
+        
+        return _FERNET.decrypt(encrypted_data.encode('ascii')).decode()
     except InvalidToken:
         logger.error("Invalid encryption key or corrupted data")
         return None
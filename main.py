@@ -8,7 +8,6 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent))
 
 import config
-from bot.telegram_bot import TelegramBot
 from includes.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -38,6 +37,10 @@ def main():
             logger.info("Generate one with: python -c 'from cryptography.fernet import Fernet; print(Fernet.generate_key().decode())'")
             sys.exit(1)
         
+        # Imported only after the config checks: this pulls in instagrapi,
+        # the MySQL connector and every automation module
+        from bot.telegram_bot import TelegramBot
+        
         # Create and run bot
         bot = TelegramBot()
         logger.info("Bot initialized successfully")
@@ -1,9 +1,14 @@
 """Automation modules for Instagram tasks."""
+import importlib
 
-from .follow_followers_of_followers import FollowFollowersOfFollowers
-from .like_stories_of_followers import LikeStoriesOfFollowers
-from .comment_emoji import CommentEmoji
-from .unfollow_after_delay import UnfollowAfterDelay
+# Module classes are imported on first access (PEP 562) so importing the
+# package does not pull in every automation module up front
+_LAZY_IMPORTS = {
+    'FollowFollowersOfFollowers': '.follow_followers_of_followers',
+    'LikeStoriesOfFollowers': '.like_stories_of_followers',
+    'CommentEmoji': '.comment_emoji',
+    'UnfollowAfterDelay': '.unfollow_after_delay',
+}
 
 __all__ = [
     'FollowFollowersOfFollowers',
@@ -11,3 +16,12 @@ __all__ = [
     'CommentEmoji',
     'UnfollowAfterDelay'
 ]
+
+
+def __getattr__(name: str):
+    """Import an automation module class on first access."""
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_IMPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
@@ -1,28 +1,25 @@
 """Module to like and comment on followers' posts."""
 import logging
 import random
-from typing import List
+from datetime import datetime
+from itertools import accumulate
+from typing import List, Tuple
 
 import config
 from includes.logger import setup_logger
 
 logger = setup_logger(__name__)
 
-# Emoji comments
-EMOJI_COMMENTS = [
-    "❤️",
-    "🔥",
-    "😍",
-    "👏",
-    "✨",
-    "💯",
-    "👍",
-    "🙌",
-    "❤️🔥",
-    "✨✨",
-    "🔥🔥",
-    "😍😍",
-]
+__all__ = ['CommentEmoji']
+
+# Comment choice per liked post: None (no comment) 70% of the time,
+# otherwise an emoji from the pool, sampled with a single RNG call
+COMMENT_PROBABILITY = 0.3
+_COMMENT_CHOICES = (None, *config.EMOJI_COMMENTS)
+_COMMENT_CUM_WEIGHTS = list(accumulate(
+    [1 - COMMENT_PROBABILITY]
+    + [COMMENT_PROBABILITY / len(config.EMOJI_COMMENTS)] * len(config.EMOJI_COMMENTS)
+))
 
 
 class CommentEmoji:
@@ -38,6 +35,8 @@ class CommentEmoji:
         self.client = insta_client
         self.scheduler = scheduler
         self.module_name = "comment_emoji"
+        # Module-local generator, independent of the global random state
+        self._rng = random.Random()
 
     def run(self):
         """Execute the like and comment logic directly."""
@@ -65,67 +64,28 @@ class CommentEmoji:
             )
             return
         
-        logger.info(f"Got {len(followers)} followers from database")
+        logger.info("Got %s followers from database", len(followers))
         
         # Randomly select some followers
         num_to_interact = min(8, len(followers))
-        selected_followers = random.sample(followers, num_to_interact)
+        selected_followers = self._rng.sample(followers, num_to_interact)
         
-        logger.info(f"Selected {num_to_interact} followers to interact with")
+        logger.info("Selected %s followers to interact with", num_to_interact)
         
         likes_count = 0
         comments_count = 0
+        pending_logs = []
         
-        for follower in selected_followers:
-            try:
-                # Get recent posts
-                medias = self.client.get_user_medias(follower.pk, amount=3)
-                
-                if not medias:
-                    logger.debug(f"No posts for {follower.username}")
-                    continue
-                
-                logger.info(f"📷 User {follower.username} has {len(medias)} recent posts")
-                
-                # Like and optionally comment on first post
-                media = medias[0]
-                
-                # Like post
-                if self.client.safe_like(media.pk):
-                    likes_count += 1
-                    logger.info(f"✅ Liked post from {follower.username}")
-                    
-                    self.client.db.log_action(
-                        'like',
-                        str(media.pk),
-                        True,
-                        f"Liked post from {follower.username}"
-                    )
-                    
-                    # 30% chance to comment emoji
-                    if random.random() < 0.3:
-                        emoji = random.choice(EMOJI_COMMENTS)
-                        
-                        if self.client.safe_comment(media.pk, emoji):
-                            comments_count += 1
-                            logger.info(f"✅ Commented '{emoji}' on {follower.username}'s post")
-                            
-                            self.client.db.log_action(
-                                'comment',
-                                str(media.pk),
-                                True,
-                                f"Commented on {follower.username}'s post"
-                            )
-                        else:
-                            logger.warning(f"Failed to comment on {follower.username}'s post")
-                else:
-                    logger.warning(f"Failed to like {follower.username}'s post")
-                    
-            except Exception as e:
-                logger.error(f"Error processing posts for {follower.username}: {e}")
-                continue
+        try:
+            for follower in selected_followers:
+                liked, commented, logs = self._interact(follower)
+                likes_count += liked
+                comments_count += commented
+                pending_logs.extend(logs)
+        finally:
+            self.client.db.log_actions_bulk(pending_logs)
         
-        logger.info(f"✅ Like/Comment complete. Liked: {likes_count}, Commented: {comments_count}")
+        logger.info("✅ Like/Comment complete. Liked: %s, Commented: %s", likes_count, comments_count)
         
         if likes_count > 0 or comments_count > 0:
             self.client._notify(
@@ -134,3 +94,55 @@ class CommentEmoji:
                 f"💬 Comments: {comments_count}\n"
                 f"👥 Interacted with {num_to_interact} followers"
             )
+
+    def _interact(self, follower) -> Tuple[int, int, List[tuple]]:
+        """Like a follower's latest post and maybe comment on it.
+        
+        Args:
+            follower: Follower to interact with
+            
+        Returns:
+            Tuple (likes, comments, action log rows)
+        """
+        likes = comments = 0
+        logs = []
+        
+        try:
+            # Get recent posts
+            medias = self.client.get_user_medias(follower.pk, amount=3)
+            
+            if not medias:
+                logger.debug("No posts for %s", follower.username)
+                return likes, comments, logs
+            
+            logger.info("📷 User %s has %s recent posts", follower.username, len(medias))
+            
+            # Like and optionally comment on first post
+            media = medias[0]
+            media_id = str(media.pk)
+            
+            # Like post
+            if not self.client.safe_like(media.pk):
+                logger.warning("Failed to like %s's post", follower.username)
+                return likes, comments, logs
+            
+            likes += 1
+            logger.info("✅ Liked post from %s", follower.username)
+            logs.append(('like', media_id, True, f"Liked post from {follower.username}", datetime.now()))
+            
+            # 30% chance to comment emoji
+            emoji = self._rng.choices(_COMMENT_CHOICES, cum_weights=_COMMENT_CUM_WEIGHTS)[0]
+            if emoji is None:
+                return likes, comments, logs
+            
+            if self.client.safe_comment(media.pk, emoji):
+                comments += 1
+                logger.info("✅ Commented '%s' on %s's post", emoji, follower.username)
+                logs.append(('comment', media_id, True, f"Commented on {follower.username}'s post", datetime.now()))
+            else:
+                logger.warning("Failed to comment on %s's post", follower.username)
+                
+        except Exception as e:
+            logger.error(f"Error processing posts for {follower.username}: {e}")
+        
+        return likes, comments, logs
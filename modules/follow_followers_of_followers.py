@@ -1,11 +1,13 @@
 """Module to follow followers of your followers."""
-import random
 import logging
-from typing import List, Set
+from itertools import islice
+from typing import Iterable, List
 
 from core.insta_client import InstagramClient
+from core.jitter import shuffle_sec
 from core.scheduler import TaskScheduler, TaskPriority
-from includes.database import Database
+from includes.database import get_db
+from includes.id_set import IdSet
 from includes.logger import setup_logger
 import config
 
@@ -24,8 +26,8 @@ class FollowFollowersOfFollowers:
         """
         self.client = insta_client
         self.scheduler = scheduler
-        self.db = Database()
-        self.already_followed: Set[int] = set()
+        self.db = get_db()
+        self.already_followed = IdSet()
 
     def run(
         self,
@@ -43,26 +45,32 @@ class FollowFollowersOfFollowers:
         try:
             logger.info("Starting follow followers of followers module")
             
-            my_user_id = self.client.get_my_user_id()
+            # Seed from the follows table so earlier runs are not repeated
+            self.already_followed = self.db.get_followed_user_ids()
+            logger.info("Loaded %s previously followed users", len(self.already_followed))
+            
+            my_user_id = self.client.my_user_id
             if not my_user_id:
                 logger.error("Could not get user ID")
                 return
             
             # Get my followers
-            logger.info(f"Fetching {num_followers_to_check} of your followers...")
+            logger.info("Fetching %s of your followers...", num_followers_to_check)
             my_followers = self.client.get_user_followers(my_user_id, num_followers_to_check)
             
             if not my_followers:
                 logger.warning("No followers found")
                 return
             
-            logger.info(f"Found {len(my_followers)} followers")
+            logger.info("Found %s followers", len(my_followers))
             
             # Randomly select followers to check
-            random.shuffle(my_followers)
+            shuffle_sec(my_followers)
             
-            tasks = []
             total_targets = 0
+            # The run is paced as one stream of max_total_follows slots over an
+            # hour; each follower's batch takes the next len(tasks) slots
+            slot_seconds = 60 * 60 / max(1, max_total_follows)
             
             for follower in my_followers:
                 if total_targets >= max_total_follows:
@@ -71,96 +79,98 @@ class FollowFollowersOfFollowers:
                 follower_id = follower.pk
                 follower_username = follower.username
                 
-                logger.info(f"Checking followers of @{follower_username}...")
+                logger.info("Checking followers of @%s...", follower_username)
                 
-                # Get their followers
-                their_followers = self.client.get_user_followers(
-                    follower_id,
-                    followers_per_user * 2  # Get extra to filter
+                # Stream their followers (extra to filter); pages are only
+                # fetched until enough targets pass the filter
+                wanted = min(followers_per_user, max_total_follows - total_targets)
+                their_followers = islice(
+                    self.client.iter_user_followers(follower_id, page_size=wanted * 2),
+                    wanted * 2
                 )
                 
-                if not their_followers:
-                    continue
-                
                 # Filter and select targets
-                targets = self._filter_targets(their_followers, followers_per_user)
+                targets = self._filter_targets(their_followers, wanted)
+                if not targets:
+                    continue
                 
-                for target in targets:
-                    if total_targets >= max_total_follows:
-                        break
-                    
-                    # Schedule follow task
-                    tasks.append({
+                tasks = [
+                    {
                         'func': self._follow_user,
                         'task_type': 'follow',
                         'priority': TaskPriority.NORMAL,
                         'args': (target.pk, target.username, f"follower_of_{follower_username}")
-                    })
-                    
-                    total_targets += 1
-            
-            if tasks:
-                # Schedule tasks with randomization
+                    }
+                    for target in targets
+                ]
+                
+                # Schedule this follower's targets right away so the worker can
+                # start following while the remaining followers are fetched
                 self.scheduler.schedule_batch(
                     tasks,
                     randomize_order=True,
-                    spread_over_minutes=60  # Spread over 1 hour
+                    spread_over_minutes=len(tasks) * slot_seconds / 60,
+                    start_delay=int(total_targets * slot_seconds)
                 )
-                logger.info(f"Scheduled {len(tasks)} follow tasks")
+                total_targets += len(tasks)
+            
+            if total_targets:
+                logger.info("Scheduled %s follow tasks", total_targets)
             else:
                 logger.info("No suitable targets found")
                 
         except Exception as e:
             logger.error(f"Follow module error: {e}", exc_info=True)
 
-    def _filter_targets(self, users: List, max_count: int) -> List:
+    def _filter_targets(self, users: Iterable, max_count: int) -> List:
         """Filter and select target users.
         
         Args:
-            users: List of user objects
+            users: Iterable of user objects (consumed only until max_count match)
             max_count: Maximum users to return
             
         Returns:
             List of filtered users
         """
-        filtered = []
+        already_followed = self.already_followed
         
-        for user in users:
-            # Skip if already followed
-            if user.pk in self.already_followed:
-                continue
-            
-            # Skip private accounts
-            if user.is_private:
-                continue
-            
-            # Skip verified accounts (celebrities)
-            if getattr(user, 'is_verified', False):
-                continue
-            
-            # Skip accounts with suspicious follower ratios
-            follower_count = getattr(user, 'follower_count', 0)
-            following_count = getattr(user, 'following_count', 1)
-            
-            if follower_count > 10000:  # Too popular
-                continue
-            
-            if following_count < 10:  # Inactive or bot
-                continue
-            
-            ratio = following_count / follower_count if follower_count > 0 else 999
-            if ratio > 5 or ratio < 0.1:  # Suspicious ratio
-                continue
-            
-            filtered.append(user)
+        # Lazily filter and stop as soon as max_count targets are found
+        candidates = (
+            user for user in users
+            if user.pk not in already_followed and self._is_good_target(user)
+        )
+        filtered = list(islice(candidates, max_count))
+        
+        shuffle_sec(filtered)
+        return filtered
+
+    @staticmethod
+    def _is_good_target(user) -> bool:
+        """Check whether a user looks like a real, reachable account.
+        
+        Args:
+            user: User object
             
-            if len(filtered) >= max_count:
-                break
+        Returns:
+            bool: True if the user passes the target filters
+        """
+        is_private, is_verified, follower_count, following_count = (
+            user.is_private,
+            getattr(user, 'is_verified', False),
+            getattr(user, 'follower_count', 0),
+            getattr(user, 'following_count', 1),
+        )
+        
+        # Skip private, verified (celebrities), too popular (>10k) and
+        # inactive/bot (<10 following) accounts
+        if is_private or is_verified or follower_count > 10000 or following_count < 10:
+            return False
         
-        random.shuffle(filtered)
-        return filtered[:max_count]
+        # Skip accounts with suspicious follower ratios
+        ratio = following_count / follower_count if follower_count > 0 else 999
+        return 0.1 <= ratio <= 5
 
-    def _follow_user(self, user_id: int, username: str, source: str):
+    def _follow_user(self, user_id: str, username: str, source: str):
         """Follow a user and record.
         
         Args:
@@ -168,17 +178,18 @@ class FollowFollowersOfFollowers:
             username: Instagram username
             source: Source of follow
         """
+        uid = str(user_id)
         try:
             success = self.client.safe_follow(user_id)
             
             if success:
                 self.already_followed.add(user_id)
-                self.db.add_follow_record(str(user_id), username, source)
-                self.db.log_action('follow', str(user_id), True, f"Followed @{username} from {source}")
-                logger.info(f"Followed @{username}")
+                self.db.add_follow_record(uid, username, source)
+                self.db.log_action('follow', uid, True, f"Followed @{username} from {source}")
+                logger.info("Followed @%s", username)
             else:
-                self.db.log_action('follow', str(user_id), False, f"Failed to follow @{username}")
+                self.db.log_action('follow', uid, False, f"Failed to follow @{username}")
                 
         except Exception as e:
             logger.error(f"Error following user {user_id}: {e}")
-            self.db.log_action('follow', str(user_id), False, str(e))
+            self.db.log_action('follow', uid, False, str(e))
@@ -1,6 +1,7 @@
 """Module to view and like stories of followers."""
 import logging
 import random
+from datetime import datetime
 from typing import List
 
 import config
@@ -49,52 +50,57 @@ class LikeStoriesOfFollowers:
             )
             return
         
-        logger.info(f"Got {len(followers)} followers from database")
+        logger.info("Got %s followers from database", len(followers))
         
         # Randomly select some followers
         num_to_check = min(10, len(followers))
         selected_followers = random.sample(followers, num_to_check)
         
-        logger.info(f"Selected {num_to_check} followers to check stories")
+        logger.info("Selected %s followers to check stories", num_to_check)
         
         stories_viewed = 0
+        pending_logs = []
         
-        for follower in selected_followers:
-            try:
-                # Get stories
-                stories = self.client.get_user_stories(follower.pk)
-                
-                if stories:
-                    logger.info(f"📖 User {follower.username} has {len(stories)} stories")
-                    
-                    # View some stories (not all)
-                    num_to_view = min(3, len(stories))
+        try:
+            for follower in selected_followers:
+                try:
+                    # Get stories
+                    stories = self.client.get_user_stories(follower.pk)
                     
-                    for story in stories[:num_to_view]:
-                        success = self.client.safe_view_story(story.pk)
+                    if stories:
+                        logger.info("📖 User %s has %s stories", follower.username, len(stories))
+                        
+                        # View some stories (not all)
+                        num_to_view = min(3, len(stories))
+                        follower_id = str(follower.pk)
                         
-                        if success:
-                            stories_viewed += 1
-                            logger.info(f"✅ Viewed story from {follower.username}")
+                        for story in stories[:num_to_view]:
+                            success = self.client.safe_view_story(story.pk)
                             
-                            # Log to database
-                            self.client.db.log_action(
-                                'story_view',
-                                str(follower.pk),
-                                True,
-                                f"Viewed story from {follower.username}"
-                            )
-                        else:
-                            logger.warning(f"Failed to view story from {follower.username}")
-                            break
-                else:
-                    logger.debug(f"No stories for {follower.username}")
-                    
-            except Exception as e:
-                logger.error(f"Error processing stories for {follower.username}: {e}")
-                continue
+                            if success:
+                                stories_viewed += 1
+                                logger.info("✅ Viewed story from %s", follower.username)
+                                
+                                pending_logs.append((
+                                    'story_view',
+                                    follower_id,
+                                    True,
+                                    f"Viewed story from {follower.username}",
+                                    datetime.now()
+                                ))
+                            else:
+                                logger.warning("Failed to view story from %s", follower.username)
+                                break
+                    else:
+                        logger.debug("No stories for %s", follower.username)
+                        
+                except Exception as e:
+                    logger.error(f"Error processing stories for {follower.username}: {e}")
+                    continue
+        finally:
+            self.client.db.log_actions_bulk(pending_logs)
         
-        logger.info(f"✅ Story viewing complete. Viewed {stories_viewed} stories")
+        logger.info("✅ Story viewing complete. Viewed %s stories", stories_viewed)
         
         if stories_viewed > 0:
             self.client._notify(
@@ -3,7 +3,7 @@ import logging
 
 from core.insta_client import InstagramClient
 from core.scheduler import TaskScheduler, TaskPriority
-from includes.database import Database
+from includes.database import get_db
 from includes.logger import setup_logger
 import config
 
@@ -22,7 +22,7 @@ class UnfollowAfterDelay:
         """
         self.client = insta_client
         self.scheduler = scheduler
-        self.db = Database()
+        self.db = get_db()
 
     def run(self, max_unfollows: int = 30):
         """Execute unfollow strategy.
@@ -33,36 +33,38 @@ class UnfollowAfterDelay:
         try:
             logger.info("Starting unfollow after delay module")
             
-            # Get users to unfollow
-            users_to_unfollow = self.db.get_users_to_unfollow(config.UNFOLLOW_AFTER_DAYS)
+            # Get users to unfollow (oldest follows first, at most max_unfollows)
+            users_to_unfollow = self.db.get_users_to_unfollow(
+                config.UNFOLLOW_AFTER_DAYS,
+                limit=max_unfollows
+            )
             
             if not users_to_unfollow:
                 logger.info("No users to unfollow")
                 return
             
-            logger.info(f"Found {len(users_to_unfollow)} users to unfollow")
+            logger.info("Found %s users to unfollow", len(users_to_unfollow))
             
-            # Limit to max_unfollows
-            users_to_unfollow = users_to_unfollow[:max_unfollows]
-            
-            tasks = []
-            for user in users_to_unfollow:
-                tasks.append({
-                    'func': self._unfollow_user,
+            fn = self._unfollow_user
+            prio = TaskPriority.LOW
+            tasks = [
+                {
+                    'func': fn,
                     'task_type': 'unfollow',
-                    'priority': TaskPriority.LOW,
+                    'priority': prio,
                     'args': (user['user_id'], user['username'])
-                })
+                }
+                for user in users_to_unfollow
+            ]
+            
+            # Schedule with randomization
+            self.scheduler.schedule_batch(
+                tasks,
+                randomize_order=True,
+                spread_over_minutes=60  # Spread over 1 hour
+            )
+            logger.info("Scheduled %s unfollow tasks", len(tasks))
             
-            if tasks:
-                # Schedule with randomization
-                self.scheduler.schedule_batch(
-                    tasks,
-                    randomize_order=True,
-                    spread_over_minutes=60  # Spread over 1 hour
-                )
-                logger.info(f"Scheduled {len(tasks)} unfollow tasks")
-                
         except Exception as e:
             logger.error(f"Unfollow module error: {e}", exc_info=True)
 
@@ -79,7 +81,7 @@ class UnfollowAfterDelay:
             if success:
                 self.db.mark_unfollowed(user_id)
                 self.db.log_action('unfollow', user_id, True, f"Unfollowed @{username}")
-                logger.info(f"Unfollowed @{username}")
+                logger.info("Unfollowed @%s", username)
             else:
                 self.db.log_action('unfollow', user_id, False, f"Failed to unfollow @{username}")
                 
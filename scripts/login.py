@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """Instagram Login Script with 2FA Support."""
 
+import re
 import sys
 from pathlib import Path
 
@@ -13,12 +14,17 @@ from instagrapi import Client
 from instagrapi.exceptions import (
     TwoFactorRequired, ChallengeRequired,
     BadPassword, PleaseWaitFewMinutes,
-    ClientError
+    ClientError, LoginRequired
 )
 
-print("\n" + "="*60)
+SESSION_FILE = config.SESSION_DIR / f"{config.INSTAGRAM_USERNAME}_session.json"
+BANNER = "=" * 60
+CODE_PROMPT = "Enter 2FA code (attempt {}/{}): ".format
+_is_2fa_code = re.compile(r'\d{6}\Z').match
+
+print("\n" + BANNER)
 print("Instagram Login")
-print("="*60 + "\n")
+print(BANNER + "\n")
 
 if not config.INSTAGRAM_USERNAME or not config.INSTAGRAM_PASSWORD:
     print("❌ Error: Credentials not found in .env file")
@@ -33,6 +39,29 @@ print("\n⏳ Connecting to Instagram...\n")
 cl = Client()
 cl.delay_range = [1, 3]
 
+# Reuse a saved session if it is still valid - skips the full password login
+if SESSION_FILE.exists():
+    try:
+        print("Checking saved session...")
+        cl.load_settings(SESSION_FILE)
+        cl.get_timeline_feed()
+        
+        print("\n✅ Saved session is still valid, reused it")
+        print(f"✅ Session file: {SESSION_FILE}")
+        print("\n" + BANNER)
+        print("✅ SUCCESS! You can now run: bash scripts/run.sh")
+        print(BANNER + "\n")
+        sys.exit(0)
+        
+    except LoginRequired:
+        print("⚠️  Saved session expired, logging in with password...\n")
+    except Exception as e:
+        print(f"⚠️  Could not reuse saved session ({e}), logging in with password...\n")
+    
+    # Start from a clean client so stale cookies don't leak into the new login
+    cl = Client()
+    cl.delay_range = [1, 3]
+
 try:
     # First attempt - login without 2FA
     print("Attempting login...")
@@ -42,14 +71,13 @@ try:
     print("\n✅ Login successful!")
     
     # Save session
-    session_file = config.SESSION_DIR / f"{config.INSTAGRAM_USERNAME}_session.json"
-    cl.dump_settings(session_file)
+    cl.dump_settings(SESSION_FILE)
     
-    print(f"✅ Session saved: {session_file}")
+    print(f"✅ Session saved: {SESSION_FILE}")
     print(f"✅ User ID: {cl.user_id}")
-    print("\n" + "="*60)
+    print("\n" + BANNER)
     print("✅ SUCCESS! You can now run: bash scripts/run.sh")
-    print("="*60 + "\n")
+    print(BANNER + "\n")
     sys.exit(0)
 
 except TwoFactorRequired:
@@ -62,13 +90,13 @@ except TwoFactorRequired:
     max_attempts = 3
     for attempt in range(max_attempts):
         try:
-            code = input(f"Enter 2FA code (attempt {attempt + 1}/{max_attempts}): ").strip()
+            code = input(CODE_PROMPT(attempt + 1, max_attempts)).strip()
             
             if not code:
                 print("❌ Code cannot be empty\n")
                 continue
             
-            if len(code) != 6 or not code.isdigit():
+            if not _is_2fa_code(code):
                 print("❌ Code must be exactly 6 digits\n")
                 continue
             
@@ -84,14 +112,13 @@ except TwoFactorRequired:
             print("✅ 2FA verification successful!")
             
             # Save session
-            session_file = config.SESSION_DIR / f"{config.INSTAGRAM_USERNAME}_session.json"
-            cl.dump_settings(session_file)
+            cl.dump_settings(SESSION_FILE)
             
-            print(f"✅ Session saved: {session_file}")
+            print(f"✅ Session saved: {SESSION_FILE}")
             print(f"✅ User ID: {cl.user_id}")
-            print("\n" + "="*60)
+            print("\n" + BANNER)
             print("✅ SUCCESS! You can now run: bash scripts/run.sh")
-            print("="*60 + "\n")
+            print(BANNER + "\n")
             sys.exit(0)
             
         except ClientError as e:
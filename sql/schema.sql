@@ -14,7 +14,8 @@ CREATE TABLE IF NOT EXISTS action_logs (
     created_at DATETIME NOT NULL,
     INDEX idx_action_type (action_type),
     INDEX idx_created_at (created_at),
-    INDEX idx_success (success)
+    INDEX idx_success (success),
+    INDEX idx_action_success_time (action_type, success, created_at)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 -- Follows tracking table
@@ -27,7 +28,8 @@ CREATE TABLE IF NOT EXISTS follows (
     source VARCHAR(255) NULL,
     INDEX idx_user_id (user_id),
     INDEX idx_followed_at (followed_at),
-    INDEX idx_unfollowed_at (unfollowed_at)
+    INDEX idx_unfollowed_at (unfollowed_at),
+    INDEX idx_unfollowed_followed (unfollowed_at, followed_at)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 -- Settings table
@@ -52,3 +54,8 @@ CREATE TABLE IF NOT EXISTS bot_statistics (
     created_at DATETIME NOT NULL,
     UNIQUE KEY idx_stat_date (stat_date)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- Upgrading an existing database: add the composite indexes used by
+-- rate-limit counts and unfollow candidate queries
+-- ALTER TABLE action_logs ADD INDEX idx_action_success_time (action_type, success, created_at);
+-- ALTER TABLE follows ADD INDEX idx_unfollowed_followed (unfollowed_at, followed_at);